@@ -12,6 +12,7 @@ class Config:
     START_URL: str = os.getenv("CRAWLER_START_URL", "http://localhost:6006")
     MAX_DEPTH: int = int(os.getenv("CRAWLER_MAX_DEPTH", "3"))
     OUTPUT_DIR: str = os.getenv("CRAWLER_OUTPUT_DIR", "process/crawler")
+    CONCURRENCY: int = int(os.getenv("CRAWLER_CONCURRENCY", "4"))
     
     # Playwright settings
     HEADLESS: bool = os.getenv("PLAYWRIGHT_HEADLESS", "true").lower() == "true"
@@ -24,6 +25,7 @@ class Config:
             "START_URL": cls.START_URL,
             "MAX_DEPTH": cls.MAX_DEPTH,
             "OUTPUT_DIR": cls.OUTPUT_DIR,
+            "CONCURRENCY": cls.CONCURRENCY,
             "HEADLESS": cls.HEADLESS,
             "TIMEOUT": cls.TIMEOUT
         }
@@ -1,7 +1,8 @@
 import json
 import os
+import hashlib
 from playwright.async_api import Page, Locator
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator
 from config import config
 import aiofiles
 from pydantic import BaseModel
@@ -23,6 +24,12 @@ class DiscoveryStrategy(ABC):
     async def discover_components(self, page: Page) -> List[Component]:
         """Discover components from the given page."""
         pass
+    
+    async def discover_components_iter(self, page: Page) -> AsyncIterator[Component]:
+        """Yield components as they are discovered; strategies that find them
+        incrementally override this so callers can start processing early."""
+        for component in await self.discover_components(page):
+            yield component
 
 class SelectorDiscoveryStrategy(DiscoveryStrategy):
     """Discovers components using CSS selectors."""
@@ -34,7 +41,10 @@ class SelectorDiscoveryStrategy(DiscoveryStrategy):
     
     async def discover_components(self, page: Page) -> List[Component]:
         """Discover components from storybook explorer tree."""
-        components = []
+        return [component async for component in self.discover_components_iter(page)]
+    
+    async def discover_components_iter(self, page: Page) -> AsyncIterator[Component]:
+        """Yield components from the storybook explorer tree as each link is read."""
         discovered_urls = set()  # Track unique URLs to avoid duplicates during discovery
         
         try:
@@ -79,9 +89,9 @@ class SelectorDiscoveryStrategy(DiscoveryStrategy):
                         url=href,
                         selectors=[str(link)]
                     )
-                    components.append(component)
                     discovered_urls.add(href)
                     print(f"Discovered: {name} -> {href}")
+                    yield component
                     
                 except Exception as e:
                     print(f"Warning: Could not process link {i} - {str(e)}")
@@ -90,8 +100,7 @@ class SelectorDiscoveryStrategy(DiscoveryStrategy):
             print(f"Error during component discovery: {str(e)}")
             raise
         
-        print(f"Total unique components discovered: {len(components)}")
-        return components
+        print(f"Total unique components discovered: {len(discovered_urls)}")
     
     async def _expand_all_hierarchies(self, tree, page):
         """Recursively expand all hierarchical elements until no more can be expanded."""
@@ -237,16 +246,26 @@ class ComponentCrawler:
         """
         return await self.discovery_strategy.discover_components(page)
     
-    async def process_component(self, component: Component, page: Page) -> ComponentData:
+    def discover_components_iter(self, page: Page) -> AsyncIterator[Component]:
+        """
+        Yields components as the configured discovery strategy finds them.
+        
+        :param page: Playwright page instance
+        :return: Async iterator of discovered components
+        """
+        return self.discovery_strategy.discover_components_iter(page)
+    
+    async def process_component(self, component: Component, page: Page, base_url: Optional[str] = None) -> ComponentData:
         """
         Extracts component data and relationships.
         
         :param component: Target component
         :param page: Playwright page instance
+        :param base_url: URL that a relative component URL resolves against (defaults to the page's current URL)
         :return: Structured component data
         """
         # Navigate to component page
-        await self.page_handler.navigate_to_component(page, component.url)
+        await self.page_handler.navigate_to_component(page, component.url, base_url)
         
         # Extract page content
         content = await self.page_handler.extract_page_content(page)
@@ -265,11 +284,15 @@ class ComponentCrawler:
         # Ensure output directory exists
         os.makedirs(config.OUTPUT_DIR, exist_ok=True)
         
-        # Create filename-safe component name
+        # Create filename-safe component name; story names such as "Default" repeat
+        # across components, so a short hash of the (unique) URL keeps files that
+        # concurrent workers save in the same second apart
         safe_name = "".join(c if c.isalnum() else "_" for c in component_data.name)
-        filename = f"{safe_name}_{datetime.utcnow().strftime('%Y%m%d%H%M%S')}.json"
+        url_hash = hashlib.sha256(component_data.url.encode('utf-8')).hexdigest()[:10]
+        filename = f"{safe_name}_{url_hash}_{datetime.utcnow().strftime('%Y%m%d%H%M%S')}.json"
         filepath = os.path.join(config.OUTPUT_DIR, filename)
         
-        # Write data as JSON
-        async with aiofiles.open(filepath, "w") as f:
+        # Write data as JSON; exclusive creation makes a name collision between
+        # concurrent workers fail loudly instead of overwriting another component
+        async with aiofiles.open(filepath, "x") as f:
             await f.write(component_data.json())
\ No newline at end of file
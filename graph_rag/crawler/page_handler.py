@@ -1,23 +1,25 @@
 import json
 from playwright.async_api import Page
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 from bs4 import BeautifulSoup
 from config import config
 
 class PageHandler:
     """Handles page interactions and navigation."""
     
-    async def navigate_to_component(self, page: Page, component_url: str) -> None:
+    async def navigate_to_component(self, page: Page, component_url: str, base_url: Optional[str] = None) -> None:
         """
         Navigates to a component page with minimal waiting.
         
         :param page: Playwright page instance
         :param component_url: URL of the component page
+        :param base_url: URL that relative component URLs resolve against (defaults to the page's current URL)
         """
+        current_url = base_url or page.url
         try:
             # Handle relative URLs by building absolute URL
             if component_url.startswith('/') or component_url.startswith('?'):
-                base_url = page.url.split('?')[0].split('#')[0]  # Get base URL without query/fragment
+                base_url = current_url.split('?')[0].split('#')[0]  # Get base URL without query/fragment
                 if component_url.startswith('?'):
                     full_url = f"{base_url}{component_url}"
                 else:
@@ -26,7 +28,7 @@ class PageHandler:
                     full_url = urljoin(base_url, component_url)
             elif component_url.startswith('#'):
                 # For hash fragments, stay on current page
-                full_url = page.url.split('#')[0] + component_url
+                full_url = current_url.split('#')[0] + component_url
             else:
                 full_url = component_url
             
@@ -5,22 +5,33 @@ This module implements a hybrid extraction approach combining:
 - Traditional HTML parsing with BeautifulSoup
 - LLM-based semantic analysis with LlamaIndex PropertyGraphIndex
 - Schema-guided entity and relationship extraction
+
+Submodules are imported on first access of their exports, so a single module
+can be used without the dependencies of the others, e.g. RelationshipAnalyzer
+without BeautifulSoup, lxml or LlamaIndex.
 """
 
-from .metadata_extractor import MetadataExtractor
-from .content_parser import ContentParser
-from .relationship_analyzer import RelationshipAnalyzer
-from .kg_extractor import KGExtractor
-from .extractor import ExtractionOrchestrator
-from .data_models import ComponentData, ExtractedComponent, KGResult
+import importlib
+
+_EXPORTS = {
+    "MetadataExtractor": ".metadata_extractor",
+    "ContentParser": ".content_parser",
+    "RelationshipAnalyzer": ".relationship_analyzer",
+    "KGExtractor": ".kg_extractor",
+    "ExtractionOrchestrator": ".extractor",
+    "ExtractionCache": ".extraction_cache",
+    "ComponentData": ".data_models",
+    "ExtractedComponent": ".data_models",
+    "KGResult": ".data_models"
+}
+
+__all__ = list(_EXPORTS)
+
 
-__all__ = [
-    "MetadataExtractor",
-    "ContentParser", 
-    "RelationshipAnalyzer",
-    "KGExtractor",
-    "ExtractionOrchestrator",
-    "ComponentData",
-    "ExtractedComponent",
-    "KGResult"
-]
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
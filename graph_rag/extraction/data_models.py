@@ -6,11 +6,17 @@ Defines the structure for extracted component data and knowledge graph results.
 
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class ComponentMetadata(BaseModel):
-    """Basic metadata extracted from component pages."""
+    """Basic metadata extracted from component pages. Immutable once built.
+
+    Frozen models are only hashable when all their fields are; tags is a list,
+    so instances are not.
+    """
+    model_config = ConfigDict(frozen=True)
+
     name: str
     title: str
     url: str
@@ -47,7 +53,9 @@ class CodeExample(BaseModel):
 
 
 class ComponentDependency(BaseModel):
-    """Dependency relationship between components."""
+    """Dependency relationship between components. Immutable and hashable once built."""
+    model_config = ConfigDict(frozen=True)
+
     source: str
     target: str
     relationship_type: str  # e.g., "depends_on", "extends", "imports"
@@ -66,7 +74,9 @@ class ExtractedComponent(BaseModel):
 
 
 class KGEntity(BaseModel):
-    """Knowledge graph entity (node)."""
+    """Knowledge graph entity (node). Immutable once built."""
+    model_config = ConfigDict(frozen=True)
+
     id: str
     type: str  # COMPONENT, PROPERTY, VALUE_OPTION, etc.
     properties: Dict[str, Any] = Field(default_factory=dict)
@@ -80,7 +90,9 @@ class KGEntity(BaseModel):
 
 
 class KGRelation(BaseModel):
-    """Knowledge graph relation (edge)."""
+    """Knowledge graph relation (edge). Immutable once built."""
+    model_config = ConfigDict(frozen=True)
+
     source_id: str
     target_id: str
     relation_type: str  # HAS_PROPERTY, HAS_OPTION, etc.
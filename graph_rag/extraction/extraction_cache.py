@@ -0,0 +1,152 @@
+"""
+Content-addressable cache for per-file extraction results.
+
+Results are keyed by the SHA-256 of (model, prompt version, page HTML), so
+re-running extraction over unchanged crawler output skips both the base
+component extraction and the billed LLM call. Each entry expires after a
+TTL chosen from the page URL: versioned docs change rarely, latest docs often.
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import logging
+import tempfile
+from pathlib import Path
+from typing import Dict, Any, Optional, Union
+
+
+logger = logging.getLogger(__name__)
+
+DAY_SECONDS = 24 * 60 * 60
+
+# Docs pinned to a release change rarely; docs tracking the latest release often
+STABLE_TTL_SECONDS = 30 * DAY_SECONDS
+LATEST_TTL_SECONDS = DAY_SECONDS
+DEFAULT_TTL_SECONDS = 7 * DAY_SECONDS
+
+_STABLE_URL_RE = re.compile(r'/(?:stable|v\d+\.\d+(?:\.\d+)?)/')
+_LATEST_URL_RE = re.compile(r'/(?:latest|main|next)/')
+
+
+class ExtractionCache:
+    """Stores extraction results as `{key}.json` files in a cache directory."""
+
+    def __init__(self, cache_dir: Union[str, Path]):
+        """
+        Initialize the extraction cache.
+
+        Args:
+            cache_dir: Directory holding the cache entries; created on first write
+        """
+        self.cache_dir = Path(cache_dir)
+
+    @staticmethod
+    def make_key(model: str, prompt_version: str, html: Union[str, bytes]) -> str:
+        """Build the cache key for a page.
+
+        The HTML is length-prefixed so that no two (model, prompt version, html)
+        combinations serialize to the same bytes.
+
+        Args:
+            model: Name of the LLM model used for extraction
+            prompt_version: Version of the extraction prompts
+            html: Page HTML as str or UTF-8 bytes
+
+        Returns:
+            Hex SHA-256 digest
+        """
+        html_bytes = html.encode('utf-8') if isinstance(html, str) else html
+        return hashlib.sha256(b"\x00".join([
+            model.encode('utf-8'),
+            prompt_version.encode('utf-8'),
+            len(html_bytes).to_bytes(8, 'little'),
+            html_bytes
+        ])).hexdigest()
+
+    @staticmethod
+    def ttl_for_url(url: str) -> int:
+        """Cache lifetime in seconds for results extracted from url."""
+        if _LATEST_URL_RE.search(url):
+            return LATEST_TTL_SECONDS
+        if _STABLE_URL_RE.search(url):
+            return STABLE_TTL_SECONDS
+        return DEFAULT_TTL_SECONDS
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached result for key, or None on a miss.
+        
+        Expired entries count as misses and are removed, so the caller
+        extracts the page again and stores a fresh entry.
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                entry = json.loads(f.read())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable extraction cache entry {path}: {e}")
+            return None
+
+        try:
+            expires_at = entry["created_at"] + entry["ttl_seconds"]
+            result = entry["result"]
+        except (KeyError, TypeError):
+            logger.warning(f"Ignoring malformed extraction cache entry {path}")
+            return None
+
+        if time.time() >= expires_at:
+            logger.info(f"Evicting expired extraction cache entry {path}")
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            return None
+        return result
+
+    def set(self,
+            key: str,
+            value: Union[Dict[str, Any], bytes],
+            ttl_seconds: int = DEFAULT_TTL_SECONDS) -> None:
+        """Store a result under key for ttl_seconds.
+        
+        Args:
+            key: Cache key from make_key
+            value: JSON-serializable result, or the result already serialized as
+                UTF-8 JSON, which is embedded without being parsed again
+            ttl_seconds: Lifetime of the entry
+        """
+        path = self._path(key)
+        created_at = time.time()
+        try:
+            if isinstance(value, bytes):
+                payload = b''.join([
+                    b'{"result": ', value,
+                    b', "created_at": ', json.dumps(created_at).encode('ascii'),
+                    b', "ttl_seconds": ', json.dumps(ttl_seconds).encode('ascii'), b'}'
+                ])
+            else:
+                entry = {"result": value, "created_at": created_at, "ttl_seconds": ttl_seconds}
+                payload = json.dumps(entry, ensure_ascii=False).encode('utf-8')
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first so concurrent readers never see partial JSON
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(payload)
+                os.replace(tmp_path, path)
+            except BaseException:
+                # Leave no orphaned temporary file behind in the cache directory
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Failed to write extraction cache entry {path}: {e}")
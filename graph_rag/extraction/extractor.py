@@ -9,13 +9,15 @@ import json
 import logging
 import asyncio
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
 from datetime import datetime
+from pydantic import ValidationError
 
 from .metadata_extractor import MetadataExtractor
 from .content_parser import ContentParser
 from .relationship_analyzer import RelationshipAnalyzer
-from .kg_extractor import KGExtractor
+from .kg_extractor import KGExtractor, PROMPT_VERSION, LLM_METHODS
+from .extraction_cache import ExtractionCache
 from .data_models import ExtractedComponent, ComponentProperty, KGResult
 
 
@@ -27,16 +29,30 @@ class ExtractionOrchestrator:
     
     def __init__(self,
                  crawler_output_dir: str = "process/crawler",
-                 output_dir: str = "process/extraction"):
+                 output_dir: str = "process/extraction",
+                 kg_extractor: Optional[KGExtractor] = None,
+                 enable_kg_extraction: bool = True,
+                 use_cache: bool = True,
+                 cache_dir: Optional[Union[str, Path]] = None):
         """
         Initialize the extraction orchestrator.
         
         Args:
             crawler_output_dir: Directory containing crawler JSON files
             output_dir: Directory for extraction outputs
+            kg_extractor: Existing KG extractor to share, along with its LLM
+                client, instead of creating a new one
+            enable_kg_extraction: Whether process_all_components extracts knowledge graphs
+            use_cache: Whether KG results are reused for unchanged pages
+            cache_dir: Directory of the KG result cache (default: output_dir/.cache)
         """
         self.crawler_output_dir = Path(crawler_output_dir)
         self.output_dir = Path(output_dir)
+        self.enable_kg_extraction = enable_kg_extraction
+        
+        # KG results keyed by (model, prompt version, page HTML), so unchanged
+        # pages skip the LLM; the same cache test_extraction.py uses
+        self.cache = ExtractionCache(cache_dir or self.output_dir / ".cache") if use_cache else None
         
         # Create output directory
         self.output_dir.mkdir(parents=True, exist_ok=True)
@@ -46,12 +62,15 @@ class ExtractionOrchestrator:
         self.content_parser = ContentParser()
         self.relationship_analyzer = RelationshipAnalyzer()
         
-        try:
-            self.kg_extractor = KGExtractor()
-            logger.info("KG extractor initialized")
-        except Exception as e:
-            logger.error(f"Failed to initialize KG extractor: {e}")
-            raise
+        if kg_extractor is not None:
+            self.kg_extractor = kg_extractor
+        else:
+            try:
+                self.kg_extractor = KGExtractor()
+                logger.info("KG extractor initialized")
+            except Exception as e:
+                logger.error(f"Failed to initialize KG extractor: {e}")
+                raise
             
     def process_all_components(self) -> Dict[str, Any]:
         """
@@ -72,6 +91,8 @@ class ExtractionOrchestrator:
             
         # Process each file
         extracted_components = []
+        kg_inputs = []
+        kg_cache_entries = []  # (cache key, page URL) per entry of kg_inputs
         kg_results = []
         processing_errors = []
         
@@ -83,27 +104,49 @@ class ExtractionOrchestrator:
                 with open(json_file, 'r', encoding='utf-8') as f:
                     crawler_data = json.load(f)
                     
+                # Encoded once for the cache key and the lxml-based extractors
+                html_content = crawler_data.get('html', '')
+                html_bytes = html_content.encode('utf-8', errors='replace')
+                
                 # Extract component data
-                component_data = self.extract_component(crawler_data)
+                component_data = self.extract_component(crawler_data, html_bytes=html_bytes)
                 extracted_components.append(component_data)
                 
                 # Save individual component data
                 self._save_component_data(component_data)
                 
-                # Extract knowledge graph if enabled
+                # Queue knowledge graph extraction if enabled, unless the page is cached
                 if self.enable_kg_extraction:
-                    kg_result = self.kg_extractor.extract_knowledge_graph(
-                        component_data, 
-                        crawler_data.get('html', '')
-                    )
-                    kg_results.append(kg_result)
-                    self._save_kg_result(kg_result)
+                    cache_key = None
+                    if self.cache is not None:
+                        cache_key = ExtractionCache.make_key(
+                            self.kg_extractor.model_name, PROMPT_VERSION, html_bytes
+                        )
+                        cached_result = self._load_cached_kg_result(cache_key)
+                        if cached_result is not None:
+                            logger.info(f"Using cached KG result for {component_data.metadata.name}")
+                            kg_results.append(cached_result)
+                            continue
+                    kg_inputs.append((component_data, html_content))
+                    kg_cache_entries.append((cache_key, crawler_data.get('url', '')))
                     
             except Exception as e:
                 error_msg = f"Failed to process {json_file.name}: {e}"
                 logger.error(error_msg)
                 processing_errors.append(error_msg)
                 
+        # Extract knowledge graphs in batches to share LLM round-trips
+        if kg_inputs:
+            extracted = self.kg_extractor.extract_knowledge_graph_batch(kg_inputs)
+            for kg_result, (cache_key, url) in zip(extracted, kg_cache_entries):
+                # Only LLM results are cached; fallbacks should be retried next run
+                if cache_key is not None and kg_result.extraction_metadata.get("method") in LLM_METHODS:
+                    self.cache.set(cache_key, kg_result.model_dump(mode='json'),
+                                   ttl_seconds=ExtractionCache.ttl_for_url(url))
+            kg_results.extend(extracted)
+        for kg_result in kg_results:
+            self._save_kg_result(kg_result)
+                
         # Analyze relationships between all components
         if extracted_components:
             self._analyze_cross_component_relationships(extracted_components)
@@ -132,19 +175,26 @@ class ExtractionOrchestrator:
         logger.info(f"Extraction complete. Summary saved to {summary_file}")
         return summary
         
-    def extract_component(self, crawler_data: Dict[str, Any]) -> ExtractedComponent:
+    def extract_component(self,
+                        crawler_data: Dict[str, Any],
+                        html_bytes: Optional[bytes] = None) -> ExtractedComponent:
         """
         Extract complete component data from crawler JSON.
         
         Args:
             crawler_data: JSON data from crawler
+            html_bytes: The crawler HTML already encoded as UTF-8, if the caller has it
             
         Returns:
             ExtractedComponent with all extracted information
         """
+        # Both lxml-based extractors take the page as UTF-8 bytes, encoded at most once
+        if html_bytes is None:
+            html_bytes = crawler_data.get('html', '').encode('utf-8', errors='replace')
+        
         # Extract basic metadata
         metadata = MetadataExtractor.extract_component_metadata(
-            html_content=crawler_data.get('html', ''),
+            html_content=html_bytes,
             name=crawler_data.get('name', 'Unknown'),
             url=crawler_data.get('url', '')
         )
@@ -154,7 +204,7 @@ class ExtractionOrchestrator:
         soup = BeautifulSoup(crawler_data.get('html', ''), 'html.parser')
         
         # Extract properties from args table
-        properties_data = MetadataExtractor.extract_properties_table(soup)
+        properties_data = MetadataExtractor.extract_properties_table(html_bytes)
         properties = [
             ComponentProperty(
                 name=prop['name'],
@@ -189,6 +239,17 @@ class ExtractionOrchestrator:
             extraction_timestamp=datetime.now()
         )
         
+    def _load_cached_kg_result(self, cache_key: str) -> Optional[KGResult]:
+        """Return the cached KG result for cache_key, or None on a miss."""
+        cached = self.cache.get(cache_key)
+        if cached is None:
+            return None
+        try:
+            return KGResult.model_validate(cached)
+        except ValidationError as e:
+            logger.warning(f"Ignoring invalid cached KG result {cache_key}: {e}")
+            return None
+        
     def _save_component_data(self, component_data: ExtractedComponent) -> None:
         """Save individual component data to JSON file."""
         filename = f"{component_data.metadata.name}_extracted.json"
@@ -256,31 +317,8 @@ class ExtractionOrchestrator:
         filename = f"{kg_result.source_component}_kg.json"
         filepath = self.output_dir / filename
         
-        # Convert to dict for JSON serialization
-        data_dict = {
-            "entities": [
-                {
-                    "id": entity.id,
-                    "type": entity.type,
-                    "properties": entity.properties
-                }
-                for entity in kg_result.entities
-            ],
-            "relations": [
-                {
-                    "source_id": relation.source_id,
-                    "target_id": relation.target_id,
-                    "relation_type": relation.relation_type,
-                    "properties": relation.properties
-                }
-                for relation in kg_result.relations
-            ],
-            "source_component": kg_result.source_component,
-            "extraction_metadata": kg_result.extraction_metadata
-        }
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data_dict, f, indent=2, ensure_ascii=False)
+        # Serialize in pydantic-core without building an intermediate dict
+        filepath.write_bytes(kg_result.model_dump_json(indent=2).encode('utf-8'))
             
         logger.debug(f"Saved KG result to {filepath}")
         
@@ -288,29 +326,9 @@ class ExtractionOrchestrator:
         """Save combined KG result."""
         filepath = self.output_dir / "combined_kg.json"
         
-        data_dict = {
-            "entities": [
-                {
-                    "id": entity.id,
-                    "type": entity.type,
-                    "properties": entity.properties
-                }
-                for entity in combined_kg.entities
-            ],
-            "relations": [
-                {
-                    "source_id": relation.source_id,
-                    "target_id": relation.target_id,
-                    "relation_type": relation.relation_type,
-                    "properties": relation.properties
-                }
-                for relation in combined_kg.relations
-            ],
-            "extraction_metadata": combined_kg.extraction_metadata
-        }
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data_dict, f, indent=2, ensure_ascii=False)
+        filepath.write_bytes(
+            combined_kg.model_dump_json(indent=2, exclude={"source_component"}).encode('utf-8')
+        )
             
         logger.info(f"Saved combined KG result to {filepath}")
         
@@ -380,6 +398,8 @@ def main():
                        help="Directory for extraction outputs")
     parser.add_argument("--no-kg", action="store_true",
                        help="Disable knowledge graph extraction")
+    parser.add_argument("--no-cache", action="store_true",
+                       help="Re-extract every knowledge graph with the LLM, ignoring and not writing cached results")
     
     args = parser.parse_args()
     
@@ -393,7 +413,8 @@ def main():
     orchestrator = ExtractionOrchestrator(
         crawler_output_dir=args.input_dir,
         output_dir=args.output_dir,
-        enable_kg_extraction=not args.no_kg
+        enable_kg_extraction=not args.no_kg,
+        use_cache=not args.no_cache
     )
     
     summary = orchestrator.process_all_components()
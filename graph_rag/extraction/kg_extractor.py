@@ -4,12 +4,27 @@ Final working implementation.
 """
 
 import os
+import re
+import asyncio
+import httpx
+import json
 import logging
+from functools import lru_cache
 from typing import List, Dict, Any, Optional, Tuple
 from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser as HTMLParser
+from openai import APITimeoutError, RateLimitError
+from tenacity import (
+    before_sleep_log,
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
 from llama_index.core import Document, PropertyGraphIndex, Settings
-from llama_index.core.indices.property_graph import SchemaLLMPathExtractor
+from llama_index.core.indices.property_graph import SchemaLLMPathExtractor, DynamicLLMPathExtractor
 from llama_index.core.graph_stores import SimpleGraphStore
+from llama_index.core.embeddings import BaseEmbedding
 from llama_index.llms.openai import OpenAI
 from llama_index.embeddings.openai import OpenAIEmbedding
 from .data_models import KGResult, KGEntity, KGRelation, ExtractedComponent
@@ -17,13 +32,142 @@ from llama_index.llms.deepseek import DeepSeek
 
 logger = logging.getLogger(__name__)
 
+# Components combined into one extraction document; larger batches trade
+# extraction quality for fewer LLM round-trips.
+DEFAULT_BATCH_SIZE = 4
+COMPONENT_DELIMITER = "### COMPONENT {index} ###"
+BATCH_PROMPT_HEADER = f"""
+The following sections each document a separate component and start with a
+'{COMPONENT_DELIMITER.format(index="i")}' delimiter. Extract triplets for every section,
+report them under that section's index, and use each component's exact name as
+the subject of triplets about that component.
+
+"""
+
+# Version of the extraction prompts below; bump it whenever they change so
+# cached extraction results keyed on it are invalidated
+PROMPT_VERSION = "2"
+
+# Static parts of the per-component extraction prompt
+_EXTRACT_PROMPT_HEADER = """
+Extract knowledge triplets from this structured component documentation.
+Follow the format: (subject, predicate, object)
+
+Examples of valid triplets:
+- (ComponentName, has_property, PropertyName)
+- (PropertyName, has_type, TypeName)
+- (PropertyName, has_default_value, DefaultValue)
+- (ComponentName, has_value, NumericalValue)
+- (PropertyName, has_value, NumericalValue)
+"""
+_EXTRACT_PROMPT_FOOTER = """
+
+Extract knowledge triplets from both the structured metadata and documentation content.
+Focus on relationships between:
+- Components and their properties
+- Properties and their types/values
+- Components and numerical values
+- Properties and numerical values
+
+For numerical values, create explicit relationships to either the component or its properties.
+"""
+
+# Appended to the document for direct JSON-mode extraction
+_DIRECT_JSON_INSTRUCTIONS = """
+
+Return only a JSON object of the form
+{"components": {"0": [["subject", "predicate", "object"], ...], "1": [...]}}
+mapping each component section's index to every triplet extracted for it.
+A document without component delimiters is component "0".
+"""
+
+# Appended on a re-prompt after the LLM returned malformed JSON
+_FEEDBACK_INSTRUCTIONS = """
+
+Your previous output had an error: {error}
+Fix it and return only the JSON object.
+"""
+
+# Extraction methods whose results come from the LLM and may be cached
+METHOD_DIRECT_JSON = "direct_json"
+METHOD_PROPERTY_GRAPH = "DynamicLLMPathExtractor"
+LLM_METHODS = (METHOD_DIRECT_JSON, METHOD_PROPERTY_GRAPH)
+
+# LLM calls per extraction before falling back to manual extraction
+EXTRACTION_MAX_ATTEMPTS = 3
+
+# Re-prompts with the parse error after malformed JSON-mode output
+FEEDBACK_RETRIES = 2
+
+# Upper bound on distinct numerical values listed in one extraction prompt
+MAX_NUM_VALUES = 50
+
+# Matches integer and decimal text nodes such as "12" or "0.5"
+_NUM_RE = re.compile(r'^\d+(?:\.\d+)?$')
+# Same pattern applied line by line to newline-separated page text
+_NUM_LINE_RE = re.compile(_NUM_RE.pattern, re.MULTILINE)
+
+# Elements whose content is not documentation text
+_NON_TEXT_TAGS = ['script', 'style', 'template']
+
+# Runs of empty lines; selectolax emits a separator even for whitespace-only text nodes
+_BLANK_LINES_RE = re.compile(r'\n(?:[ \t]*\n)+')
+
+
+def _node_text(node) -> str:
+    """Newline-separated text of a selectolax node, as BeautifulSoup's
+    get_text(separator='\\n', strip=True) returns it."""
+    return _BLANK_LINES_RE.sub('\n', node.text(separator='\n', strip=True)).strip()
+
+
+@lru_cache(maxsize=4096)
+def _all_numeric(options: Tuple[str, ...]) -> bool:
+    """Whether every option is a number; memoized since option lists repeat across components."""
+    return all(_NUM_RE.match(option) for option in options)
+
+
+# Shared zero vector; embedding consumers only read it, so no per-call copy
+_ZERO_EMBEDDING = [0.0] * 384
+
+
+class DummyEmbedding(BaseEmbedding):
+    """Constant embedder; KG extraction does not need vector similarity."""
+    
+    def _get_query_embedding(self, query: str) -> List[float]:
+        return _ZERO_EMBEDDING
+        
+    def _get_text_embedding(self, text: str) -> List[float]:
+        return _ZERO_EMBEDDING
+        
+    async def _aget_text_embedding(self, text: str) -> List[float]:
+        return _ZERO_EMBEDDING
+        
+    async def _aget_query_embedding(self, query: str) -> List[float]:
+        return _ZERO_EMBEDDING
+
+
+_DUMMY_EMBEDDING = DummyEmbedding(embed_batch_size=1)
+
+
 class KGExtractor:
     """Extracts knowledge graphs from component documentation."""
     
     def __init__(self,
                  llm_model: Optional[str] = None,
                  embedding_model: Optional[str] = None,
-                 temperature: float = 0.1):
+                 temperature: float = 0.1,
+                 async_http_client: Optional[httpx.AsyncClient] = None):
+        """
+        Args:
+            llm_model: Model name shown in logs
+            embedding_model: Embedding model name shown in logs
+            temperature: LLM sampling temperature
+            async_http_client: Shared client for the direct JSON-mode LLM calls, so
+                every extraction reuses one connection pool. An httpx client
+                cannot move between event loops, so it is only used on the loop
+                running when the extractor is created; the sync wrappers and the
+                PropertyGraphIndex path use the default client
+        """
         # Validate OpenAI API key
         if not os.getenv("OPENAI_API_KEY"):
             raise ValueError("OPENAI_API_KEY environment variable is required")
@@ -40,70 +184,119 @@ class KGExtractor:
         actual_model_for_client = model_name
         
         # Initialize OpenAI client with Deepseek configuration
-        self.llm = DeepSeek(
-            model="deepseek-chat",
+        self.model_name = "deepseek-chat"
+        llm_kwargs = dict(
+            model=self.model_name,
             temperature=temperature,
             api_base="https://api.deepseek.com",
-            api_key=os.getenv("OPENAI_API_KEY")
+            api_key=os.getenv("OPENAI_API_KEY"),
+            # Rate-limit and timeout retries are left to the tenacity decorators on
+            # _direct_extract and _run_extraction; client retries would multiply them
+            max_retries=0
         )
+        self.llm = DeepSeek(**llm_kwargs)
         Settings.llm = self.llm
+        
+        # LLM on the shared client, bound to the event loop running now (see _direct_llm)
+        self._shared_client_llm = None
+        self._shared_client_loop: Optional[asyncio.AbstractEventLoop] = None
+        if async_http_client is not None:
+            try:
+                self._shared_client_loop = asyncio.get_running_loop()
+            except RuntimeError:
+                logger.warning("async_http_client ignored: KGExtractor was not created inside an event loop")
+            else:
+                self._shared_client_llm = DeepSeek(async_http_client=async_http_client, **llm_kwargs)
 
         # Configure embeddings - use a simple embedder since we're focused on KG extraction
-        from llama_index.core.embeddings import BaseEmbedding
-        class DummyEmbedding(BaseEmbedding):
-            def _get_query_embedding(self, query: str) -> List[float]:
-                return [0.0] * 384
-                
-            def _get_text_embedding(self, text: str) -> List[float]:
-                return [0.0] * 384
-                
-            async def _aget_text_embedding(self, text: str) -> List[float]:
-                return [0.0] * 384
-                
-            async def _aget_query_embedding(self, query: str) -> List[float]:
-                return [0.0] * 384
-                
-        Settings.embed_model = DummyEmbedding(embed_batch_size=1)
+        Settings.embed_model = _DUMMY_EMBEDDING
+        
+        # Triples come from a direct JSON-mode LLM call by default; the
+        # PropertyGraphIndex pipeline remains available as a fallback
+        self._use_property_graph_index = os.getenv("KG_USE_PROPERTY_GRAPH_INDEX", "0") == "1"
+        
+        # Path extractor is stateless w.r.t. input documents, so one instance is shared
+        self._path_extractor = DynamicLLMPathExtractor(
+            llm=self.llm,
+            num_workers=4  # Only supported parameter
+        )
+        logger.debug(f"Initialized DynamicLLMPathExtractor with LLM: {self.llm}")
+        
+        # Concurrency limit for in-flight extractions; the semaphore is bound
+        # lazily to the running event loop (see _semaphore)
+        self._max_concurrency = int(os.getenv("KG_MAX_CONCURRENCY", "16"))
+        self._sem: Optional[asyncio.Semaphore] = None
+        self._sem_loop: Optional[asyncio.AbstractEventLoop] = None
         
         logger.info(f"Initialized KGExtractor with LLM configuration for: {actual_model_for_client} (display name: {llm_model_display_name}, base_url: {base_url})")
 
+    def _extract_html_text(self,
+                         html_content: str,
+                         tree: Optional[HTMLParser] = None) -> str:
+        """Extract the documentation text from component HTML in a single text walk.
+        
+        Uses selectolax's lexbor parser, falling back to BeautifulSoup if
+        selectolax cannot handle the document.
+        
+        Args:
+            html_content: Raw HTML content of the component documentation
+            tree: Already parsed html_content, to avoid parsing it again
+            
+        Returns:
+            Newline-separated documentation text
+        """
+        try:
+            if tree is None:
+                tree = HTMLParser(html_content)
+            tree.strip_tags(_NON_TEXT_TAGS)
+            storybook_root = tree.css_first('div#storybook-root')
+            if storybook_root is not None:
+                # Found storybook content - extract text from this div
+                html_text = _node_text(storybook_root)
+                logger.debug(f"Extracted content from #storybook-root: {html_text[:200]}...")
+                return html_text
+            error_div = tree.css_first('div.sb-nopreview')
+            error_text = error_div.text() if error_div is not None else ""
+        except Exception as e:
+            logger.warning(f"selectolax failed to parse HTML ({e}) - falling back to BeautifulSoup")
+            tree = None
+            soup = BeautifulSoup(html_content, 'lxml')
+            storybook_root = soup.find('div', id='storybook-root')
+            if storybook_root is not None:
+                return storybook_root.get_text(separator='\n', strip=True)
+            error_div = soup.find('div', class_='sb-nopreview')
+            error_text = error_div.get_text() if error_div is not None else ""
+        
+        if "Sorry, but you" in error_text:
+            # This is an error page
+            logger.warning("Found Storybook error page - using minimal content")
+            return "Component documentation not available"
+        
+        # Fallback to full text extraction
+        if tree is not None:
+            html_text = _node_text(tree)
+        else:
+            html_text = soup.get_text(separator='\n', strip=True)
+        logger.debug(f"Using full HTML content as fallback: {html_text[:200]}...")
+        return html_text
+
     def _prepare_document_text(self,
                             component_data: ExtractedComponent,
-                            html_content: str) -> str:
+                            html_content: str,
+                            tree: Optional[HTMLParser] = None) -> str:
         """Prepare document text from component data and HTML content.
         
         Args:
             component_data: Extracted component metadata and properties
             html_content: Raw HTML content of the component documentation
+            tree: Already parsed html_content, to avoid parsing it again
             
         Returns:
             Combined document text for knowledge graph extraction
         """
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
-        # Try to extract content from storybook-root div first
-        storybook_root = soup.find('div', id='storybook-root')
-        html_text = ""
-        
-        if storybook_root:
-            # Found storybook content - extract text from this div
-            html_text = storybook_root.get_text(separator='\n', strip=True)
-            logger.debug(f"Extracted content from #storybook-root: {html_text[:200]}...")
-        else:
-            # Check if this is an error page
-            error_div = soup.find('div', class_='sb-nopreview')
-            if error_div and "Sorry, but you" in error_div.get_text():
-                logger.warning("Found Storybook error page - using minimal content")
-                html_text = "Component documentation not available"
-            else:
-                # Fallback to full text extraction
-                html_text = soup.get_text(separator='\n', strip=True)
-                logger.debug(f"Using full HTML content as fallback: {html_text[:200]}...")
-        
-        # Verify we have clean text (no HTML tags)
-        if "<" in html_text or ">" in html_text:
-            logger.warning("HTML tags detected in extracted text - cleaning")
-            html_text = BeautifulSoup(html_text, 'html.parser').get_text()
+        # Text extracted from the parsed tree never contains markup; any '<' or '>'
+        # left in it is literal document text (e.g. "a < b"), so no re-parse is needed
+        html_text = self._extract_html_text(html_content, tree)
         
         # Prepare structured component metadata with enhanced LLM prompt
         description = component_data.metadata.description or "Component documentation"
@@ -111,233 +304,363 @@ class KGExtractor:
             description = "Component documentation"
             
         # Prepare properties section only if we have valid properties
-        properties_text = ""
+        property_parts = []
         if component_data.properties:
-            properties_text = "\nProperties:\n"
+            property_parts.append("\nProperties:\n")
             for prop in component_data.properties:
                 if "short descriptionsummary" not in prop.description.lower():
-                    properties_text += f"""
+                    property_parts.append(f"""
 - Property: {prop.name}
 Type: {prop.type}
 Description: {prop.description}
 Default: {prop.default_value or 'None'}
 Required: {'Yes' if prop.required else 'No'}
-"""
+""")
                     # Explicitly relate property to component
-                    properties_text += f"Relation: ({component_data.metadata.name}, has_property, {prop.name})\n"
+                    property_parts.append(f"Relation: ({component_data.metadata.name}, has_property, {prop.name})\n")
+        properties_text = "".join(property_parts)
         
-        component_text = f"""
-Extract knowledge triplets from this structured component documentation.
-Follow the format: (subject, predicate, object)
-
-Examples of valid triplets:
-- (ComponentName, has_property, PropertyName)
-- (PropertyName, has_type, TypeName)
-- (PropertyName, has_default_value, DefaultValue)
-- (ComponentName, has_value, NumericalValue)
-- (PropertyName, has_value, NumericalValue)
-
+        parts = [_EXTRACT_PROMPT_HEADER, f"""
 Component Metadata:
 - Name: {component_data.metadata.name}
 - Description: {description}
 - Category: {component_data.metadata.category or 'Uncategorized'}
 {properties_text}
-"""
+"""]
 
-        # Add numerical data points if present in HTML with explicit relations
-        soup = BeautifulSoup(html_content, 'html.parser')
-        numerical_data = []
-        for element in soup.find_all(string=True):
-            text = element.strip()
-            if text.replace('.','',1).isdigit():  # Check if numeric
-                numerical_data.append(text)
+        # Add numerical data points found in the documentation text with explicit
+        # relations. Scanning the already extracted text avoids a second walk over
+        # the DOM. Values are deduplicated in first-seen order and capped, since
+        # each one adds a line per property to the prompt.
+        numerical_data = {}
+        for match in _NUM_LINE_RE.finditer(html_text):
+            numerical_data[match.group()] = None
+            if len(numerical_data) >= MAX_NUM_VALUES:
+                break
         
         if numerical_data:
-            component_text += "\nNumerical Data Points:\n"
+            parts.append("\nNumerical Data Points:\n")
             for value in numerical_data:
-                component_text += f"- Value: {value}\n"
+                parts.append(f"- Value: {value}\n")
                 # Explicitly relate numerical values to component
-                component_text += f"Possible relations:\n"
-                component_text += f"({component_data.metadata.name}, has_value, {value})\n"
-                if component_data.properties:
-                    for prop in component_data.properties:
-                        component_text += f"({prop.name}, has_value, {value})\n"
+                parts.append("Possible relations:\n")
+                parts.append(f"({component_data.metadata.name}, has_value, {value})\n")
+                parts.extend(f"({prop.name}, has_value, {value})\n" for prop in component_data.properties)
         
         # Combine both sources with clear separation
-        return f"""{component_text}
-
-Documentation Content:
-{html_text}
-
-Extract knowledge triplets from both the structured metadata and documentation content.
-Focus on relationships between:
-- Components and their properties
-- Properties and their types/values
-- Components and numerical values
-- Properties and numerical values
-
-For numerical values, create explicit relationships to either the component or its properties.
-"""
+        parts.append("\n\nDocumentation Content:\n")
+        parts.append(html_text)
+        parts.append(_EXTRACT_PROMPT_FOOTER)
+        return "".join(parts)
 
     def extract_knowledge_graph(self,
                              component_data: ExtractedComponent,
                              html_content: str) -> KGResult:
         """Extract knowledge graph from component data using PropertyGraphIndex."""
-        try:
-            # Validate HTML content
-            soup = BeautifulSoup(html_content, 'html.parser')
-            storybook_root = soup.find('div', id='storybook-root')
-            error_div = soup.find('div', class_='sb-nopreview')
-            
-            # Only treat as error page if we have explicit error message AND no valid content
-            if (error_div and "Sorry, but you" in error_div.get_text() and
-                not storybook_root and len(html_content) < 500):
-                logger.warning("Possible error page detected - but attempting extraction anyway")
-            
-            # Check for minimum viable content
-            if len(html_content) < 100:
-                logger.error(f"HTML content too short ({len(html_content)} chars) - likely invalid")
-                logger.debug(f"Raw content preview: {html_content[:200]}...")
-                return self._manual_extraction(component_data)
+        return asyncio.run(self.aextract_knowledge_graph(component_data, html_content))
+
+    def extract_knowledge_graph_batch(self,
+                                    components: List[Tuple[ExtractedComponent, str]],
+                                    batch_size: int = DEFAULT_BATCH_SIZE) -> List[KGResult]:
+        """Extract knowledge graphs for several components, sharing one LLM pass per batch.
+        
+        Args:
+            components: Pairs of extracted component data and raw HTML content
+            batch_size: Number of components combined into a single extraction document
             
-            # Prepare document content
-            document_text = self._prepare_document_text(component_data, html_content)
-            logger.debug(f"Document text preview: {document_text[:200]}...")
+        Returns:
+            One KGResult per input component, in input order
+        """
+        return asyncio.run(self.aextract_many(components, batch_size=batch_size))
+
+    async def aextract_knowledge_graph(self,
+                                     component_data: ExtractedComponent,
+                                     html_content: str) -> KGResult:
+        """Async variant of extract_knowledge_graph, bounded by KG_MAX_CONCURRENCY."""
+        async with self._semaphore():
+            results = await self._aextract_batch([(component_data, html_content)])
+        return results[0]
+
+    async def aextract_many(self,
+                          components: List[Tuple[ExtractedComponent, str]],
+                          batch_size: int = DEFAULT_BATCH_SIZE) -> List[KGResult]:
+        """Extract knowledge graphs for many components concurrently.
+        
+        Components are grouped into batches of batch_size and the batches run
+        concurrently, at most KG_MAX_CONCURRENCY at a time.
+        
+        Args:
+            components: Pairs of extracted component data and raw HTML content
+            batch_size: Number of components combined into a single extraction document
             
-            # Test LLM connection with proper async context
+        Returns:
+            One KGResult per input component, in input order
+        """
+        semaphore = self._semaphore()
+        
+        async def run_batch(batch):
+            async with semaphore:
+                return await self._aextract_batch(batch)
+        
+        batches = [components[start:start + batch_size]
+                   for start in range(0, len(components), batch_size)]
+        batch_results = await asyncio.gather(*[run_batch(batch) for batch in batches])
+        return [result for results in batch_results for result in results]
+
+    def _direct_llm(self) -> DeepSeek:
+        """Return the LLM for a direct JSON-mode call on the running event loop."""
+        if self._shared_client_llm is not None and asyncio.get_running_loop() is self._shared_client_loop:
+            return self._shared_client_llm
+        return self.llm
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        """Return the concurrency semaphore for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._sem is None or self._sem_loop is not loop:
+            self._sem = asyncio.Semaphore(self._max_concurrency)
+            self._sem_loop = loop
+        return self._sem
+
+    async def _aextract_batch(self,
+                            batch: List[Tuple[ExtractedComponent, str]]) -> List[KGResult]:
+        """Validate and prepare each component, then run one extraction for the batch."""
+        results: List[Optional[KGResult]] = [None] * len(batch)
+        prepared = []
+        
+        for position, (component_data, html_content) in enumerate(batch):
             try:
-                import asyncio
-                import nest_asyncio
-                nest_asyncio.apply()
+                # Validate HTML content; the parsed tree is reused for document preparation
+                tree = HTMLParser(html_content)
+                storybook_root = tree.css_first('div#storybook-root')
+                error_div = tree.css_first('div.sb-nopreview')
+                
+                # Only treat as error page if we have explicit error message AND no valid content
+                if (error_div is not None and "Sorry, but you" in error_div.text() and
+                    storybook_root is None and len(html_content) < 500):
+                    logger.warning("Possible error page detected - but attempting extraction anyway")
                 
-                async def test_llm_connection():
-                    try:
-                        test_prompt = "Extract knowledge triplets from: 'Button component has property color with values red, blue, green'"
-                        logger.debug(f"Sending test prompt to LLM: {test_prompt}")
-                        response = await self.llm.acomplete(test_prompt)
-                        logger.debug(f"Received test response: {response}")
-                        
-                        # Validate response contains expected triplet format
-                        if not any(x in str(response) for x in ["(", ")", ","]):
-                            raise ValueError("LLM response does not contain valid triplet format")
-                        return response
-                    except Exception as e:
-                        logger.error(f"LLM request failed: {e}")
-                        raise
+                # Check for minimum viable content
+                if len(html_content) < 100:
+                    logger.error(f"HTML content too short ({len(html_content)} chars) - likely invalid")
+                    logger.debug(f"Raw content preview: {html_content[:200]}...")
+                    results[position] = self._manual_extraction(component_data)
+                    continue
                 
-                # Get or create event loop
-                try:
-                    loop = asyncio.get_event_loop()
-                except RuntimeError:
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
+                # Prepare document content
+                document_text = self._prepare_document_text(component_data, html_content, tree=tree)
+                logger.debug(f"Document text preview: {document_text[:200]}...")
+                
+                prepared.append((position, component_data, document_text))
                 
-                test_response = loop.run_until_complete(test_llm_connection())
-                logger.debug(f"LLM connection test response: {test_response}")
             except Exception as e:
-                logger.error(f"LLM connection failed: {e}")
-                return self._manual_extraction(component_data)
-            
-            # Initialize DynamicLLMPathExtractor with supported configuration
-            logger.debug("Initializing DynamicLLMPathExtractor")
-            from llama_index.core.indices.property_graph import DynamicLLMPathExtractor
-            path_extractor = DynamicLLMPathExtractor(
-                llm=Settings.llm,
-                num_workers=4  # Only supported parameter
-            )
-            logger.debug(f"Initialized DynamicLLMPathExtractor with LLM: {Settings.llm}")
+                logger.error(f"Failed to extract KG: {e}")
+                results[position] = self._error_result(component_data, e)
+        
+        if prepared:
+            try:
+                extracted = await self._aextract_prepared([(c, t) for _, c, t in prepared])
+            except Exception as e:
+                logger.error(f"Failed to extract KG: {e}")
+                extracted = [self._error_result(c, e) for _, c, _ in prepared]
+            for (position, _, _), result in zip(prepared, extracted):
+                results[position] = result
+        
+        return results
+
+    async def _aextract_prepared(self,
+                               prepared: List[Tuple[ExtractedComponent, str]]) -> List[KGResult]:
+        """Run one LLM extraction over the combined documents of a batch.
+        
+        The PropertyGraphIndex fallback cannot attribute triples to a section of
+        a combined document, so it extracts each component of the batch separately.
+        """
+        components = [component_data for component_data, _ in prepared]
+        
+        try:
+            if self._use_property_graph_index:
+                component_triples = await asyncio.gather(*[
+                    self._property_graph_extract(text) for _, text in prepared
+                ])
+                method = METHOD_PROPERTY_GRAPH
+                batch_size = 1
+            else:
+                document_text = self._combine_document_texts([text for _, text in prepared])
+                logger.debug(f"Document text length: {len(document_text)} chars ({len(prepared)} components)")
+                logger.debug(f"Document text:\n{document_text[:500]}...")
+                # JSON mode returns the triples already grouped by component index
+                component_triples = await self._direct_extract_with_feedback(document_text, len(components))
+                method = METHOD_DIRECT_JSON
+                batch_size = len(components)
+        except Exception as e:
+            logger.error(f"KG extraction failed: {str(e)}")
+            return [self._manual_extraction(c) for c in components]
+        
+        results = []
+        for (component_data, component_text), triples in zip(prepared, component_triples):
+            # Verify and log extracted paths with more tolerance
+            if not triples:
+                logger.warning(f"No paths extracted for {component_data.metadata.name}")
+                results.append(self._manual_extraction(component_data))
+                continue
             
-            # Create PropertyGraphIndex with retries and enhanced logging
-            logger.debug("Creating PropertyGraphIndex with retries")
-            graph_store = SimpleGraphStore()
-            logger.debug(f"Document text length: {len(document_text)} chars")
+            logger.info(f"Extracted {len(triples)} paths for {component_data.metadata.name}:")
+            for i, (s, p, o) in enumerate(triples[:10]):  # Log more samples
+                logger.info(f"Path {i+1}: {s} -> {p} -> {o}")
             
-            max_attempts = 3
-            for attempt in range(max_attempts):
-                try:
-                    # Create index with proper event loop management
-                    import nest_asyncio
-                    nest_asyncio.apply()
-                    
-                    loop = asyncio.get_event_loop()
-                    if loop.is_closed():
-                        loop = asyncio.new_event_loop()
-                        asyncio.set_event_loop(loop)
-                    
-                    # Log the document text being sent for extraction
-                    logger.debug(f"Attempt {attempt+1}/{max_attempts} - Document text:\n{document_text[:500]}...")
-                    
-                    index = PropertyGraphIndex.from_documents(
-                        documents=[Document(text=document_text)],
-                        llm=self.llm,
-                        graph_store=graph_store,
-                        path_extractor=path_extractor,
-                        max_triplets_per_chunk=30,  # Increased from 20
-                        show_progress=True,
-                        chunk_size=512  # Smaller chunks for better processing
-                    )
-                    
-                    # Verify and log extracted paths with more tolerance
-                    triples = graph_store.get(subj='')
-                    if not triples:
-                        if attempt < max_attempts - 1:
-                            logger.warning(f"Empty graph store on attempt {attempt+1} - retrying")
-                            continue
-                        logger.warning("Graph store is empty after all attempts")
-                        return self._manual_extraction(component_data)
-                    
-                    logger.info(f"Extracted {len(triples)} paths on attempt {attempt+1}:")
-                    for i, (s, p, o) in enumerate(triples[:10]):  # Log more samples
-                        logger.info(f"Path {i+1}: {s} -> {p} -> {o}")
-                    
-                    # More lenient validation of path structure
-                    invalid_paths = [t for t in triples if not all(isinstance(x, str) and x.strip() for x in t)]
-                    if invalid_paths:
-                        logger.warning(f"Found {len(invalid_paths)} invalid paths (will attempt to filter)")
-                        triples = [t for t in triples if all(isinstance(x, str) and x.strip() for x in t)]
-                        if not triples:
-                            logger.warning("All paths filtered as invalid")
-                            return self._manual_extraction(component_data)
-                    
-                    break
-                except Exception as e:
-                    logger.error(f"KG extraction attempt {attempt+1} failed: {str(e)}")
-                    if attempt == max_attempts - 1:
-                        logger.error("All extraction attempts failed")
-                        return self._manual_extraction(component_data)
+            # More lenient validation of path structure
+            valid_paths = [t for t in triples if all(isinstance(x, str) and x.strip() for x in t)]
+            if len(valid_paths) < len(triples):
+                logger.warning(f"Found {len(triples) - len(valid_paths)} invalid paths (will attempt to filter)")
+                triples = valid_paths
             
-            # Extract entities and relations from the graph store
-            logger.debug("Extracting KG data from graph store")
-            entities, relations = self._extract_kg_data(graph_store, component_data.metadata.name)
+            # Extract entities and relations from the triples
+            logger.debug(f"Extracting KG data from triples for {component_data.metadata.name}")
+            entities, relations = self._extract_kg_data(triples, component_data.metadata.name)
             
             # More tolerant check for results
             if len(entities) < 3:  # Require at least 3 entities to consider successful
                 logger.warning(f"Insufficient entities extracted ({len(entities)}) - falling back to manual")
-                return self._manual_extraction(component_data)
+                results.append(self._manual_extraction(component_data))
+                continue
             
-            logger.info(f"Successfully extracted {len(entities)} entities and {len(relations)} relations using DynamicLLMPathExtractor")
+            logger.info(f"Successfully extracted {len(entities)} entities and {len(relations)} relations using {method}")
             
-            return KGResult(
+            results.append(KGResult(
                 entities=entities,
                 relations=relations,
                 source_component=component_data.metadata.name,
                 extraction_metadata={
-                    "document_length": len(document_text),
+                    "document_length": len(component_text),
                     "extraction_model": str(Settings.llm),
                     "schema_version": "1.0",
-                    "method": "DynamicLLMPathExtractor",
-                    "attempts": max_attempts
+                    "method": method,
+                    "attempts": EXTRACTION_MAX_ATTEMPTS,
+                    "batch_size": batch_size
                 }
-            )
+            ))
+        
+        return results
+
+    @retry(
+        wait=wait_exponential_jitter(initial=0.5, max=8),
+        stop=stop_after_attempt(EXTRACTION_MAX_ATTEMPTS),
+        retry=retry_if_exception_type((RateLimitError, APITimeoutError)),
+        before_sleep=before_sleep_log(logger, logging.WARNING),
+        reraise=True
+    )
+    async def _direct_extract(self,
+                            document_text: str,
+                            component_count: int,
+                            prior_error: Optional[str] = None) -> List[List[Tuple[str, str, str]]]:
+        """Extract triplets with a single JSON-mode completion.
+        
+        Args:
+            document_text: Combined extraction document
+            component_count: Number of component sections in the document
+            prior_error: Parse error of the previous attempt, fed back to the LLM
             
-        except Exception as e:
-            logger.error(f"Failed to extract KG: {e}")
-            return KGResult(
-                entities=[],
-                relations=[],
-                source_component=component_data.metadata.name,
-                extraction_metadata={"error": str(e)}
-            )
+        Returns:
+            One list of (subject, predicate, object) triplets per component, in
+            section order; malformed entries are skipped
+            
+        Raises:
+            ValueError: If the response is not a JSON object with a triplet list
+                for every component index
+        """
+        prompt = document_text + _DIRECT_JSON_INSTRUCTIONS
+        if prior_error:
+            prompt += _FEEDBACK_INSTRUCTIONS.format(error=prior_error)
+        response = await self._direct_llm().acomplete(prompt, response_format={"type": "json_object"})
+        data = json.loads(response.text)
+        groups = data.get("components") if isinstance(data, dict) else None
+        if not isinstance(groups, dict):
+            raise ValueError('expected a JSON object with a "components" object')
+        missing = [str(i) for i in range(component_count) if not isinstance(groups.get(str(i)), list)]
+        if missing:
+            raise ValueError(f"expected a list of triplets for component(s) {', '.join(missing)}")
+        return [
+            [
+                (str(subj), str(rel), str(obj))
+                for subj, rel, obj in (t for t in groups[str(i)] if isinstance(t, list) and len(t) == 3)
+            ]
+            for i in range(component_count)
+        ]
+
+    async def _direct_extract_with_feedback(self,
+                                          document_text: str,
+                                          component_count: int) -> List[List[Tuple[str, str, str]]]:
+        """Run _direct_extract, re-prompting with the error when the output is malformed.
+        
+        Malformed output costs one more call instead of a fallback to manual
+        extraction; after FEEDBACK_RETRIES re-prompts the error is raised.
+        """
+        prior_error = None
+        for attempt in range(FEEDBACK_RETRIES + 1):
+            try:
+                return await self._direct_extract(document_text, component_count, prior_error=prior_error)
+            except ValueError as e:
+                if attempt == FEEDBACK_RETRIES:
+                    raise
+                prior_error = str(e)
+                logger.warning(f"Malformed extraction output ({prior_error}), retrying with feedback")
+                await asyncio.sleep(1.0 * (attempt + 1))
+
+    async def _property_graph_extract(self, document_text: str) -> List[Tuple[str, str, str]]:
+        """Extract triplets for one component document with a PropertyGraphIndex."""
+        # The graph store accumulates results, so it is fresh per extraction
+        graph_store = SimpleGraphStore()
+        # Index construction blocks on the LLM; run it off the event loop
+        await asyncio.to_thread(self._run_extraction, document_text, graph_store)
+        return graph_store.get(subj='')
+
+    @retry(
+        wait=wait_exponential_jitter(initial=0.5, max=8),
+        stop=stop_after_attempt(EXTRACTION_MAX_ATTEMPTS),
+        retry=retry_if_exception_type((RateLimitError, APITimeoutError)),
+        before_sleep=before_sleep_log(logger, logging.WARNING),
+        reraise=True
+    )
+    def _run_extraction(self, document_text: str, graph_store: SimpleGraphStore) -> None:
+        """Build a PropertyGraphIndex over the document into graph_store.
+        
+        Only rate-limit and timeout errors are retried, with jittered exponential
+        backoff; the prepared text and store are reused across attempts.
+        
+        Args:
+            document_text: Combined extraction document
+            graph_store: Store that receives the extracted triplets
+        """
+        PropertyGraphIndex.from_documents(
+            documents=[Document(text=document_text)],
+            llm=self.llm,
+            graph_store=graph_store,
+            path_extractor=self._path_extractor,
+            max_triplets_per_chunk=30,  # Increased from 20
+            show_progress=logger.isEnabledFor(logging.DEBUG),  # tqdm only when debugging
+            chunk_size=512  # Smaller chunks for better processing
+        )
+
+    def _combine_document_texts(self, document_texts: List[str]) -> str:
+        """Join prepared document texts into one delimited extraction document."""
+        if len(document_texts) == 1:
+            return document_texts[0]
+        
+        sections = [
+            f"{COMPONENT_DELIMITER.format(index=i)}\n{text}"
+            for i, text in enumerate(document_texts)
+        ]
+        return BATCH_PROMPT_HEADER + "\n".join(sections)
+
+    def _error_result(self,
+                    component_data: ExtractedComponent,
+                    error: Exception) -> KGResult:
+        """Build an empty KGResult recording the extraction error."""
+        return KGResult(
+            entities=[],
+            relations=[],
+            source_component=component_data.metadata.name,
+            extraction_metadata={"error": str(error)}
+        )
 
     def _manual_extraction(self,
                          component_data: ExtractedComponent) -> KGResult:
@@ -357,13 +680,13 @@ For numerical values, create explicit relationships to either the component or i
         entities = [component_entity]
         relations = []
         
-        # Extract meaningful properties
-        for prop in component_data.properties:
-            # Skip generic placeholder properties
-            if ("short descriptionsummary" in prop.description.lower() or
-                "propertyName" in prop.name):
-                continue
-                
+        # Extract meaningful properties, skipping generic placeholder properties
+        meaningful_properties = [
+            prop for prop in component_data.properties
+            if not ("short descriptionsummary" in prop.description.lower() or
+                    "propertyName" in prop.name)
+        ]
+        for prop in meaningful_properties:
             prop_entity = KGEntity(
                 id=f"property_{prop.name}",
                 type="Property",
@@ -385,7 +708,7 @@ For numerical values, create explicit relationships to either the component or i
             ))
 
             # Create value entities for numerical options
-            if prop.options and all(opt.replace('.','',1).isdigit() for opt in prop.options):
+            if prop.options and _all_numeric(tuple(prop.options)):
                 for value in prop.options:
                     value_entity = KGEntity(
                         id=f"value_{prop.name}_{value}",
@@ -405,12 +728,8 @@ For numerical values, create explicit relationships to either the component or i
                     ))
 
         # Extract numerical data points from HTML content
-        soup = BeautifulSoup(component_data.raw_content, 'html.parser')
-        numerical_values = set()
-        for element in soup.find_all(string=True):
-            text = element.strip()
-            if text.replace('.','',1).isdigit():
-                numerical_values.add(text)
+        page_text = HTMLParser(component_data.raw_content).text(separator='\n', strip=True)
+        numerical_values = set(match.group() for match in _NUM_LINE_RE.finditer(page_text))
 
         # Create value entities for standalone numerical data
         for idx, value in enumerate(numerical_values):
@@ -441,12 +760,12 @@ For numerical values, create explicit relationships to either the component or i
         )
 
     def _extract_kg_data(self,
-                       graph_store: SimpleGraphStore,
+                       triples: List[Tuple[str, str, str]],
                        component_name: str) -> Tuple[List[KGEntity], List[KGRelation]]:
-        """Extract entities and relations from the graph store.
+        """Extract entities and relations from extracted triples.
         
         Args:
-            graph_store: The populated graph store
+            triples: Validated (subject, predicate, object) triples
             component_name: Name of the component being processed
             
         Returns:
@@ -456,53 +775,35 @@ For numerical values, create explicit relationships to either the component or i
         relations = []
         
         try:
-            # Get all triples from the graph store
-            logger.debug("Getting triples from graph store")
-            triples = graph_store.get(subj="")
-            logger.debug(f"Found {len(triples)} triples in graph store")
+            logger.debug(f"Building KG data from {len(triples)} triples")
             
             if not triples:
-                logger.warning("No triples found in graph store")
+                logger.warning("No triples found for component")
                 return [], []
             
-            # Track unique nodes and their properties
-            nodes = {}
-            edges = []
-            
-            # Parse triples into nodes and edges
+            # Collect node types in a single pass over the triples; entities are
+            # immutable, so they are built once all types are known
+            node_types: Dict[str, str] = {}
             for subj, rel, obj in triples:
-                # Add subject node
-                if subj not in nodes:
-                    nodes[subj] = {"type": "Unknown", "properties": {}}
-                
-                # Add object node 
-                if obj not in nodes:
-                    nodes[obj] = {"type": "Unknown", "properties": {}}
+                node_types.setdefault(subj, "Unknown")
+                node_types.setdefault(obj, "Unknown")
                 
                 # If this is a type relation, update node type
                 if rel == "type":
-                    nodes[subj]["type"] = obj
+                    node_types[subj] = obj
                 else:
                     # Otherwise it's a relationship between nodes
-                    edges.append((subj, rel, obj))
-            
-            # Create KGEntity objects
-            for node_id, node_data in nodes.items():
-                entities.append(KGEntity(
-                    id=str(node_id),
-                    type=node_data["type"],
-                    properties=node_data["properties"]
-                ))
-            
-            # Create KGRelation objects
-            for source_id, rel_type, target_id in edges:
-                relations.append(KGRelation(
-                    source_id=str(source_id),
-                    target_id=str(target_id),
-                    relation_type=rel_type,
-                    properties={}
-                ))
+                    relations.append(KGRelation(
+                        source_id=str(subj),
+                        target_id=str(obj),
+                        relation_type=rel,
+                        properties={}
+                    ))
             
+            entities = [
+                KGEntity(id=str(node_id), type=node_type, properties={})
+                for node_id, node_type in node_types.items()
+            ]
             return entities, relations
             
         except Exception as e:
@@ -6,11 +6,43 @@ Supports multi-source metadata aggregation from main page and iframe content.
 """
 
 import re
-from typing import Dict, List, Optional, Any, Union
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Optional, Any, Union, Tuple
 from datetime import datetime
+import soupsieve
+import lxml.html
 from bs4 import BeautifulSoup, Tag
+from lxml import etree
 from .data_models import ComponentMetadata
 
+# Patterns used by _clean_text, which runs once per extracted field and table cell
+_WS_RE = re.compile(r'\s+')
+_STORYBOOK_SUFFIX_RE = re.compile(r'⋅ Storybook$')
+_API_PREFIX_RE = re.compile(r'^API \/ ')
+
+
+def _has_class_xpath(class_name: str) -> str:
+    """XPath predicate equivalent to the CSS class selector .class_name"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')"
+
+
+# Args table rows in priority order; the first that yields properties wins
+_PROPERTY_ROW_XPATHS = [
+    etree.XPath(f"//*[{_has_class_xpath('sb-argstableBlock')}]//tbody//tr"),
+    etree.XPath(f"//*[{_has_class_xpath('docblock-argstable')}]//tbody//tr"),
+    etree.XPath("//table[contains(@aria-label, 'args')]//tbody//tr"),
+]
+_PROPERTY_CELLS_XPATH = etree.XPath("descendant::*[self::td or self::th]")
+
+
+@lru_cache(maxsize=256)
+def _compile_selector(selector: str) -> soupsieve.SoupSieve:
+    """Compile a CSS selector once; soup.select() would recompile it on every call."""
+    return soupsieve.compile(selector)
+
 
 class MetadataExtractor:
     """Extracts structured metadata from component HTML using CSS selectors."""
@@ -41,6 +73,17 @@ class MetadataExtractor:
         ]
     }
     
+    # LRU cache of extract_component_metadata results keyed by (HTML digest, name, url)
+    METADATA_CACHE_SIZE = 1024
+    _metadata_cache: "OrderedDict[Tuple[bytes, str, str], ComponentMetadata]" = OrderedDict()
+    _metadata_cache_lock = threading.Lock()
+    
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Drop all cached component metadata."""
+        with cls._metadata_cache_lock:
+            cls._metadata_cache.clear()
+    
     @staticmethod
     def extract(soup: BeautifulSoup, 
                 fields: List[str], 
@@ -78,24 +121,27 @@ class MetadataExtractor:
         """Extract value for a specific field using provided selectors."""
         for selector in selectors:
             try:
-                elements = soup.select(selector)
-                if not elements:
-                    continue
-                    
+                compiled = _compile_selector(selector)
+                
                 if field == "tags":
                     # Tags are typically multiple elements
-                    return [MetadataExtractor._clean_text(el.get_text()) for el in elements]
+                    elements = compiled.select(soup)
+                    if elements:
+                        return [MetadataExtractor._clean_text(el.get_text()) for el in elements]
                 elif field in ["title", "description", "category"]:
-                    # Text fields - take first non-empty match
-                    for element in elements:
+                    # Text fields - take first non-empty match; iselect stops
+                    # walking the document as soon as one is found
+                    for element in compiled.iselect(soup):
                         text = MetadataExtractor._clean_text(element.get_text())
                         if text:
                             return text
                 else:
                     # Generic text extraction
-                    text = MetadataExtractor._clean_text(elements[0].get_text())
-                    if text:
-                        return text
+                    element = compiled.select_one(soup)
+                    if element is not None:
+                        text = MetadataExtractor._clean_text(element.get_text())
+                        if text:
+                            return text
                         
             except Exception:
                 # Continue to next selector if this one fails
@@ -110,16 +156,16 @@ class MetadataExtractor:
             return ""
             
         # Remove extra whitespace and normalize
-        cleaned = re.sub(r'\s+', ' ', text.strip())
+        cleaned = _WS_RE.sub(' ', text.strip())
         
         # Remove common Storybook artifacts
-        cleaned = re.sub(r'⋅ Storybook$', '', cleaned)
-        cleaned = re.sub(r'^API \/ ', '', cleaned)
+        cleaned = _STORYBOOK_SUFFIX_RE.sub('', cleaned)
+        cleaned = _API_PREFIX_RE.sub('', cleaned)
         
         return cleaned.strip()
         
     @staticmethod
-    def extract_component_metadata(html_content: str, 
+    def extract_component_metadata(html_content: Union[str, bytes], 
                                  name: str, 
                                  url: str,
                                  custom_selectors: Optional[Dict[str, Union[str, List[str]]]] = None) -> ComponentMetadata:
@@ -127,7 +173,7 @@ class MetadataExtractor:
         Extract complete component metadata from HTML content.
         
         Args:
-            html_content: Raw HTML content
+            html_content: Raw HTML content, as text or UTF-8 bytes
             name: Component name from crawler
             url: Component URL
             custom_selectors: Custom CSS selectors for specific fields
@@ -135,7 +181,26 @@ class MetadataExtractor:
         Returns:
             ComponentMetadata object with extracted information
         """
-        soup = BeautifulSoup(html_content, 'html.parser')
+        # Encode once; the bytes serve both the cache key and the parser
+        if isinstance(html_content, str):
+            html_content = html_content.encode('utf-8', errors='replace')
+        
+        # Results only depend on the inputs, so pages seen before skip parsing;
+        # custom selectors are not part of the key and bypass the cache
+        cache_key = None
+        if custom_selectors is None:
+            digest = hashlib.blake2b(html_content, digest_size=16).digest()
+            cache_key = (digest, name, url)
+            with MetadataExtractor._metadata_cache_lock:
+                cached = MetadataExtractor._metadata_cache.get(cache_key)
+                if cached is not None:
+                    MetadataExtractor._metadata_cache.move_to_end(cache_key)
+            if cached is not None:
+                return cached.model_copy(update={"last_modified": datetime.now()}, deep=True)
+        
+        # lxml's C parser is much faster than the pure-Python html.parser; the
+        # known encoding skips BeautifulSoup's charset detection
+        soup = BeautifulSoup(html_content, 'lxml', from_encoding='utf-8')
         
         # Define fields to extract
         fields = ["title", "description", "category", "tags"]
@@ -144,7 +209,7 @@ class MetadataExtractor:
         extracted = MetadataExtractor.extract(soup, fields, custom_selectors)
         
         # Build ComponentMetadata object
-        return ComponentMetadata(
+        metadata = ComponentMetadata(
             name=name,
             title=extracted.get("title", name),  # Fall back to name if no title
             url=url,
@@ -154,6 +219,14 @@ class MetadataExtractor:
             last_modified=datetime.now()
         )
         
+        if cache_key is not None:
+            with MetadataExtractor._metadata_cache_lock:
+                MetadataExtractor._metadata_cache[cache_key] = metadata.model_copy(deep=True)
+                if len(MetadataExtractor._metadata_cache) > MetadataExtractor.METADATA_CACHE_SIZE:
+                    MetadataExtractor._metadata_cache.popitem(last=False)
+                    
+        return metadata
+        
     @staticmethod
     def extract_from_iframe(soup: BeautifulSoup) -> Dict[str, Any]:
         """
@@ -191,42 +264,55 @@ class MetadataExtractor:
         return iframe_data
         
     @staticmethod
-    def extract_properties_table(soup: BeautifulSoup) -> List[Dict[str, str]]:
+    def extract_properties_table(html_content: Union[str, bytes, BeautifulSoup]) -> List[Dict[str, str]]:
         """
         Extract component properties from Storybook args table.
         
         Args:
-            soup: Parsed HTML document
+            html_content: Raw HTML as text or UTF-8 bytes (a parsed BeautifulSoup
+                document is also accepted)
             
         Returns:
             List of property dictionaries
         """
         properties = []
         
-        # Find the args table
-        table_selectors = [
-            ".sb-argstableBlock tbody tr",
-            ".docblock-argstable tbody tr",
-            "table[aria-label*='args'] tbody tr"
-        ]
+        if isinstance(html_content, BeautifulSoup):
+            html_content = str(html_content)
+        if not html_content or not html_content.strip():
+            return properties
+        try:
+            if isinstance(html_content, bytes):
+                # Parsers are not thread-safe, so a UTF-8 parser is made per call
+                root = lxml.html.fromstring(html_content, parser=lxml.html.HTMLParser(encoding='utf-8'))
+            else:
+                root = lxml.html.fromstring(html_content)
+        except etree.ParserError:
+            # Pages without any element content (only a doctype or comments) have no table
+            return properties
         
-        for selector in table_selectors:
-            rows = soup.select(selector)
+        # Find the args table
+        for rows_xpath in _PROPERTY_ROW_XPATHS:
+            rows = rows_xpath(root)
             if not rows:
                 continue
                 
             for row in rows:
-                cells = row.find_all(['td', 'th'])
+                cells = _PROPERTY_CELLS_XPATH(row)
                 if len(cells) >= 3:  # Minimum: name, description, default
+                    # Read each cell's text once; table cells only need whitespace
+                    # normalization, not the page-title cleanup of _clean_text
+                    raw = [cell.text_content() for cell in cells[:4]]
+                    clean = [_WS_RE.sub(' ', text).strip() if text else "" for text in raw]
                     prop = {
-                        'name': MetadataExtractor._clean_text(cells[0].get_text()),
-                        'description': MetadataExtractor._clean_text(cells[1].get_text()),
-                        'default': MetadataExtractor._clean_text(cells[2].get_text()) if len(cells) > 2 else None,
-                        'control': MetadataExtractor._clean_text(cells[3].get_text()) if len(cells) > 3 else None
+                        'name': clean[0],
+                        'description': clean[1],
+                        'default': clean[2],
+                        'control': clean[3] if len(clean) > 3 else None
                     }
                     
                     # Check if property is required
-                    if '*' in cells[0].get_text() or 'required' in cells[0].get('class', []):
+                    if '*' in raw[0] or 'required' in cells[0].get('class', '').split():
                         prop['required'] = True
                         
                     properties.append(prop)
@@ -7,10 +7,199 @@ relationships and build dependency graphs.
 
 import re
 import ast
-from typing import List, Dict, Set, Optional, Tuple
-from bs4 import BeautifulSoup, Tag
+import bisect
+from functools import lru_cache
+from html.parser import HTMLParser
+from io import BytesIO
+from typing import List, Dict, Set, Optional, Tuple, Iterator, Union, FrozenSet
 from .data_models import ComponentDependency
 
+# The C-extension parsers are optional so the analyzer also runs on pure-Python
+# interpreters such as PyPy; without them the stdlib HTMLParser is used
+try:
+    from bs4 import BeautifulSoup, Tag
+except ImportError:
+    BeautifulSoup = Tag = None
+
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+try:
+    import ahocorasick
+except ImportError:  # Optional; documentation references fall back to the regex scan
+    ahocorasick = None
+
+# Compiled patterns for the analysis helpers below
+_JSX_RE = re.compile(r'<(\w+)(?:\s|>|/>)')
+_EXTENDS_RE = re.compile(r'(?:class|interface)\s+\w+\s+extends\s+(\w+)')
+_IMPLEMENTS_RE = re.compile(r'class\s+\w+\s+implements\s+(\w+)')
+# Import clause patterns, matched against the text following the import keyword
+_NAMESPACE_CLAUSE_RE = re.compile(r'\*\s+as\s+(\w+)')
+_DEFAULT_CLAUSE_RE = re.compile(r'(\w+)\s+from')
+# Capitalized words of 3+ letters not ending in a lowercase 's' (plurals); the
+# length and plural filters live in the pattern, leaving only a stop-word check
+_COMPONENT_WORD_RE = re.compile(r'\b([A-Z][a-zA-Z]+[a-rt-zA-Z])\b')
+_HREF_PATH_RE = re.compile(r'/([a-zA-Z-]+)(?:--|\?|$)')
+_HREF_PARAM_RE = re.compile(r'[?&](?:component|story)=([^&]+)')
+_NON_ALPHA_RE = re.compile(r'[^a-zA-Z]')
+
+# Capitalized names in code and documentation that are not design system components
+_NON_COMPONENT_WORDS = frozenset({
+    'API', 'HTML', 'CSS', 'DOM', 'URL', 'JSON', 'XML',
+    'React', 'Fragment', 'Suspense'
+})
+
+# Elements whose content is code or inert markup rather than documentation
+# (as in BeautifulSoup.get_text)
+_NON_TEXT_TAGS = frozenset({'script', 'style', 'template'})
+
+# Selectors for navigation links, used with BeautifulSoup
+_NAV_LINK_SELECTORS = [
+    'nav a',
+    '.navigation a',
+    '.sidebar a',
+    '[data-testid*="nav"] a',
+    '.storybook-nav a'
+]
+# The same containers, as matched by the stdlib fallback
+_NAV_CONTAINER_CLASSES = frozenset({'navigation', 'sidebar', 'storybook-nav'})
+
+# Elements without an end tag, never pushed on the fallback parser's stack
+_VOID_TAGS = frozenset({
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'param', 'source', 'track', 'wbr'
+})
+
+# Characters fed to the stdlib fallback parsers per call
+_PARSER_CHUNK_SIZE = 64 * 1024
+
+
+@lru_cache(maxsize=8)
+def _component_name_automaton(component_names: FrozenSet[str]):
+    """Aho-Corasick automaton over the known names the regex scan could report.
+    
+    Returns None when there are no such names.
+    """
+    automaton = ahocorasick.Automaton()
+    for name in component_names:
+        if _COMPONENT_WORD_RE.fullmatch(name) and name not in _NON_COMPONENT_WORDS:
+            automaton.add_word(name, name)
+    if len(automaton) == 0:
+        return None
+    automaton.make_automaton()
+    return automaton
+
+
+def _is_word_char(char: str) -> bool:
+    """Whether char is a word character in the sense of regex word boundaries."""
+    return char.isalnum() or char == '_'
+
+
+def _decode_html(html_content: Union[str, bytes]) -> str:
+    """Decode UTF-8 page bytes for the stdlib parsers."""
+    if isinstance(html_content, bytes):
+        return html_content.decode('utf-8', errors='replace')
+    return html_content
+
+
+class _TextNodeParser(HTMLParser):
+    """Collects documentation text nodes, skipping script, style and template content.
+    
+    HTMLParser may deliver a text run in pieces when it spans feed() calls, so
+    pieces are joined and only moved to texts once a tag ends the run.
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self.texts = []
+        self._pending = []
+        self._skip_depth = 0
+        
+    def _flush(self):
+        if self._pending:
+            self.texts.append(''.join(self._pending))
+            self._pending.clear()
+            
+    def handle_starttag(self, tag, attrs):
+        self._flush()
+        if tag in _NON_TEXT_TAGS:
+            self._skip_depth += 1
+            
+    def handle_endtag(self, tag):
+        self._flush()
+        if tag in _NON_TEXT_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+            
+    def handle_comment(self, data):
+        self._flush()
+        
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self._pending.append(data)
+            
+    def close(self):
+        super().close()
+        self._flush()
+
+
+class _NavigationLinkParser(HTMLParser):
+    """Collects (href, text) of links inside navigation containers.
+    
+    Matches the same containers as _NAV_LINK_SELECTORS: nav elements, the
+    navigation classes and elements whose data-testid contains "nav".
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self.links = []
+        self._stack = []  # (tag, is_nav_container) of open elements
+        self._nav_depth = 0
+        self._link_depth = 0
+        self._href = ''
+        self._text = []
+        
+    def handle_starttag(self, tag, attrs):
+        if tag == 'a' and self._nav_depth and not self._link_depth:
+            self._href = dict(attrs).get('href') or ''
+            self._text = []
+        if tag in _VOID_TAGS:
+            return
+        attributes = dict(attrs)
+        is_container = (
+            tag == 'nav' or
+            'nav' in (attributes.get('data-testid') or '') or
+            not _NAV_CONTAINER_CLASSES.isdisjoint((attributes.get('class') or '').split())
+        )
+        self._stack.append((tag, is_container))
+        self._nav_depth += is_container
+        if tag == 'a' and self._nav_depth - is_container:
+            self._link_depth += 1
+            
+    def handle_startendtag(self, tag, attrs):
+        # Self-closing elements never contain text or links
+        if tag == 'a' and self._nav_depth and not self._link_depth:
+            self.links.append((dict(attrs).get('href') or '', ''))
+            
+    def handle_endtag(self, tag):
+        # Close unclosed children along with their parent, as browsers do
+        if not any(open_tag == tag for open_tag, _ in self._stack):
+            return
+        while self._stack:
+            open_tag, is_container = self._stack.pop()
+            self._nav_depth -= is_container
+            if open_tag == 'a' and self._link_depth:
+                self._link_depth -= 1
+                if not self._link_depth:
+                    self.links.append((self._href, ''.join(self._text)))
+            if open_tag == tag:
+                break
+                
+    def handle_data(self, data):
+        if self._link_depth:
+            self._text.append(data)
+
 
 class RelationshipAnalyzer:
     """Analyzes component relationships and dependencies."""
@@ -22,6 +211,15 @@ class RelationshipAnalyzer:
         r'require\s*\(\s*[\'"]([^\'"]+)[\'"]\s*\)'
     ]
     
+    # Single-pass scanner for imports, JSX usage and inheritance. The named group
+    # gives the kind of match and the capturing group right after it the value.
+    _CODE_DEPENDENCY_RE = re.compile('|'.join(
+        [f'(?P<import{i}>{pattern})' for i, pattern in enumerate(IMPORT_PATTERNS)] +
+        [f'(?P<jsx>{_JSX_RE.pattern})',
+         f'(?P<extends>{_EXTENDS_RE.pattern})',
+         f'(?P<implements>{_IMPLEMENTS_RE.pattern})']
+    ))
+    
     # Component reference patterns
     COMPONENT_REF_PATTERNS = [
         r'<(\w+)(?:\s|>|/>)',  # JSX component usage
@@ -33,7 +231,8 @@ class RelationshipAnalyzer:
     @staticmethod
     def find_component_dependencies(component_name: str, 
                                   code_content: str,
-                                  html_content: str) -> List[ComponentDependency]:
+                                  html_content: str,
+                                  known_components: Optional[FrozenSet[str]] = None) -> List[ComponentDependency]:
         """
         Identifies component dependencies through AST and DOM analysis.
         
@@ -41,134 +240,177 @@ class RelationshipAnalyzer:
             component_name: Name of the source component
             code_content: Code examples from the component
             html_content: HTML content of the component page
+            known_components: If given, documentation references are limited to these names
             
         Returns:
             List of ComponentDependency objects
         """
-        dependencies = []
+        # Dependencies keyed by (source, target, relationship_type); the first
+        # description seen for a key wins, which also deduplicates
+        dependencies = {}
         
         # Extract dependencies from code content
         if code_content:
-            dependencies.extend(RelationshipAnalyzer._analyze_code_dependencies(
+            dependencies = RelationshipAnalyzer._analyze_code_dependencies(
                 component_name, code_content
-            ))
+            )
             
         # Extract dependencies from HTML structure
         if html_content:
-            soup = BeautifulSoup(html_content, 'html.parser')
-            dependencies.extend(RelationshipAnalyzer._analyze_dom_dependencies(
-                component_name, soup
-            ))
-            
-        # Remove duplicates
-        seen = set()
-        unique_dependencies = []
-        for dep in dependencies:
-            key = (dep.source, dep.target, dep.relationship_type)
-            if key not in seen:
-                seen.add(key)
-                unique_dependencies.append(dep)
+            soup = BeautifulSoup(html_content, 'html.parser') if BeautifulSoup is not None else None
+            dom_dependencies = RelationshipAnalyzer._analyze_dom_dependencies(
+                component_name, soup, html_content, known_components
+            )
+            for key, description in dom_dependencies.items():
+                dependencies.setdefault(key, description)
                 
-        return unique_dependencies
+        return [
+            ComponentDependency(source=source, target=target,
+                                relationship_type=relationship_type, description=description)
+            for (source, target, relationship_type), description in dependencies.items()
+        ]
         
     @staticmethod
-    def _analyze_code_dependencies(component_name: str, code_content: str) -> List[ComponentDependency]:
-        """Analyze dependencies from code examples."""
-        dependencies = []
+    def _analyze_code_dependencies(component_name: str, code_content: str) -> Dict[Tuple[str, str, str], str]:
+        """Analyze dependencies from code examples.
         
-        # Extract import statements
-        imports = RelationshipAnalyzer._extract_imports(code_content)
+        Returns:
+            Descriptions keyed by (source, target, relationship_type)
+        """
+        dependencies = {}
+        imports, component_refs, inheritance = RelationshipAnalyzer._scan_code(code_content)
+        
+        # Import statements
         for import_path, imported_items in imports.items():
             for item in imported_items:
-                dependencies.append(ComponentDependency(
-                    source=component_name,
-                    target=item,
-                    relationship_type="imports",
-                    description=f"Imports {item} from {import_path}"
-                ))
+                dependencies.setdefault(
+                    (component_name, item, "imports"),
+                    f"Imports {item} from {import_path}"
+                )
                 
-        # Extract component references
-        component_refs = RelationshipAnalyzer._extract_component_references(code_content)
+        # Component references
         for ref_component in component_refs:
             if ref_component != component_name:  # Don't self-reference
-                dependencies.append(ComponentDependency(
-                    source=component_name,
-                    target=ref_component,
-                    relationship_type="uses",
-                    description=f"Uses {ref_component} component"
-                ))
+                dependencies.setdefault(
+                    (component_name, ref_component, "uses"),
+                    f"Uses {ref_component} component"
+                )
                 
-        # Extract inheritance relationships
-        inheritance = RelationshipAnalyzer._extract_inheritance(code_content)
+        # Inheritance relationships
         for parent_class in inheritance:
-            dependencies.append(ComponentDependency(
-                source=component_name,
-                target=parent_class,
-                relationship_type="extends",
-                description=f"Extends {parent_class}"
-            ))
+            dependencies.setdefault(
+                (component_name, parent_class, "extends"),
+                f"Extends {parent_class}"
+            )
             
         return dependencies
         
     @staticmethod
-    def _extract_imports(code_content: str) -> Dict[str, List[str]]:
-        """Extract import statements and their imported items."""
+    def _scan_code(code_content: str) -> Tuple[Dict[str, List[str]], Set[str], Set[str]]:
+        """Collect imports, component references and inheritance in one regex pass.
+        
+        Args:
+            code_content: Code to analyze
+            
+        Returns:
+            Tuple of (imports by path, referenced components, parent classes)
+        """
         imports = {}
+        components = set()
+        inheritance = set()
+        line_starts = None  # Built on the first import match
         
-        for pattern in RelationshipAnalyzer.IMPORT_PATTERNS:
-            matches = re.finditer(pattern, code_content, re.MULTILINE)
-            for match in matches:
-                import_path = match.group(1)
-                
+        for match in RelationshipAnalyzer._CODE_DEPENDENCY_RE.finditer(code_content):
+            kind = match.lastgroup
+            value = match.group(match.lastindex + 1)
+            
+            if kind == 'jsx':
+                # Filter out HTML elements (lowercase) and common non-components
+                if value[0].isupper() and value not in _NON_COMPONENT_WORDS:
+                    components.add(value)
+            elif kind in ('extends', 'implements'):
+                inheritance.add(value)
+            else:
                 # Find the full import statement
+                if line_starts is None:
+                    line_starts = RelationshipAnalyzer._line_starts(code_content)
                 import_statement = RelationshipAnalyzer._find_import_statement(
-                    code_content, match.start()
+                    code_content, match.start(), line_starts
                 )
                 
                 if import_statement:
                     imported_items = RelationshipAnalyzer._parse_imported_items(import_statement)
                     if imported_items:
-                        imports[import_path] = imported_items
+                        imports[value] = imported_items
                         
-        return imports
+        return imports, components, inheritance
+        
+    @staticmethod
+    def _extract_imports(code_content: str) -> Dict[str, List[str]]:
+        """Extract import statements and their imported items."""
+        return RelationshipAnalyzer._scan_code(code_content)[0]
+        
+    @staticmethod
+    def _line_starts(code_content: str) -> List[int]:
+        """Offsets at which each line of code_content starts."""
+        line_starts = [0]
+        pos = code_content.find('\n')
+        while pos != -1:
+            line_starts.append(pos + 1)
+            pos = code_content.find('\n', pos + 1)
+        return line_starts
         
     @staticmethod
-    def _find_import_statement(code_content: str, start_pos: int) -> Optional[str]:
-        """Find the complete import statement starting from a position."""
-        lines = code_content.split('\n')
-        char_count = 0
-        
-        for line in lines:
-            if char_count <= start_pos <= char_count + len(line):
-                # Found the line containing the import
-                stripped = line.strip()
-                if stripped.startswith('import'):
-                    return stripped
-            char_count += len(line) + 1  # +1 for newline
+    def _find_import_statement(code_content: str,
+                               start_pos: int,
+                               line_starts: Optional[List[int]] = None) -> Optional[str]:
+        """Find the complete import statement starting from a position.
+        
+        Args:
+            code_content: Code containing the statement
+            start_pos: Offset of the import match
+            line_starts: Precomputed _line_starts(code_content), reused across matches
+        """
+        if line_starts is None:
+            line_starts = RelationshipAnalyzer._line_starts(code_content)
+            
+        # Binary search for the line containing the import
+        line_index = bisect.bisect_right(line_starts, start_pos) - 1
+        line_end = line_starts[line_index + 1] if line_index + 1 < len(line_starts) else None
+        stripped = code_content[line_starts[line_index]:line_end].strip()
+        if stripped.startswith('import'):
+            return stripped
             
         return None
         
     @staticmethod
     def _parse_imported_items(import_statement: str) -> List[str]:
-        """Parse imported items from an import statement."""
+        """Parse imported items from an import statement.
+        
+        The import clause is classified by its first character, so the
+        statement is scanned once rather than searched once per format.
+        """
         items = []
         
+        keyword_end = import_statement.find('import')
+        if keyword_end == -1:
+            return items
+        clause = import_statement[keyword_end + 6:].lstrip()
+        
         # Handle different import formats
-        if 'import {' in import_statement:
+        if clause.startswith('{'):
             # Named imports: import { Button, Icon } from 'library'
-            start = import_statement.find('{') + 1
-            end = import_statement.find('}')
-            if start > 0 and end > start:
-                imports_text = import_statement[start:end]
-                items = [item.strip() for item in imports_text.split(',')]
-        elif 'import * as' in import_statement:
+            end = clause.find('}')
+            if end > 0:
+                items = clause[1:end].split(',')
+        elif clause.startswith('*'):
             # Namespace import: import * as Utils from 'library'
-            match = re.search(r'import\s+\*\s+as\s+(\w+)', import_statement)
+            match = _NAMESPACE_CLAUSE_RE.match(clause)
             if match:
                 items = [match.group(1)]
-        elif 'import' in import_statement and 'from' in import_statement:
+        else:
             # Default import: import Button from 'library'
-            match = re.search(r'import\s+(\w+)\s+from', import_statement)
+            match = _DEFAULT_CLAUSE_RE.match(clause)
             if match:
                 items = [match.group(1)]
                 
@@ -177,100 +419,151 @@ class RelationshipAnalyzer:
     @staticmethod
     def _extract_component_references(code_content: str) -> Set[str]:
         """Extract component references from JSX/TSX code."""
-        components = set()
-        
-        # Find JSX component usage
-        jsx_pattern = r'<(\w+)(?:\s|>|/>)'
-        matches = re.finditer(jsx_pattern, code_content)
-        for match in matches:
-            component_name = match.group(1)
-            # Filter out HTML elements (lowercase) and common non-components
-            if (component_name[0].isupper() and 
-                component_name not in ['React', 'Fragment', 'Suspense']):
-                components.add(component_name)
-                
-        return components
+        return RelationshipAnalyzer._scan_code(code_content)[1]
         
     @staticmethod
     def _extract_inheritance(code_content: str) -> Set[str]:
         """Extract class inheritance relationships."""
-        inheritance = set()
-        
-        # Find extends and implements
-        extends_pattern = r'(?:class|interface)\s+\w+\s+extends\s+(\w+)'
-        implements_pattern = r'class\s+\w+\s+implements\s+(\w+)'
-        
-        for pattern in [extends_pattern, implements_pattern]:
-            matches = re.finditer(pattern, code_content)
-            for match in matches:
-                inheritance.add(match.group(1))
-                
-        return inheritance
+        return RelationshipAnalyzer._scan_code(code_content)[2]
         
     @staticmethod
-    def _analyze_dom_dependencies(component_name: str, soup: BeautifulSoup) -> List[ComponentDependency]:
-        """Analyze dependencies from DOM structure."""
-        dependencies = []
+    def _analyze_dom_dependencies(component_name: str,
+                                  soup: Optional["BeautifulSoup"],
+                                  html_content: Union[str, bytes],
+                                  known_components: Optional[FrozenSet[str]] = None) -> Dict[Tuple[str, str, str], str]:
+        """Analyze dependencies from DOM structure.
+        
+        Args:
+            component_name: Name of the source component
+            soup: Parsed page, or None to parse html_content with the stdlib fallback
+            html_content: HTML content of the component page
+            known_components: If given, documentation references are limited to these names
+            
+        Returns:
+            Descriptions keyed by (source, target, relationship_type)
+        """
+        dependencies = {}
         
         # Look for referenced components in documentation
-        doc_references = RelationshipAnalyzer._find_documentation_references(soup)
+        doc_references = RelationshipAnalyzer._find_documentation_references(html_content, known_components)
         for ref_component in doc_references:
             if ref_component != component_name:
-                dependencies.append(ComponentDependency(
-                    source=component_name,
-                    target=ref_component,
-                    relationship_type="references",
-                    description=f"Referenced in documentation"
-                ))
+                dependencies.setdefault(
+                    (component_name, ref_component, "references"),
+                    f"Referenced in documentation"
+                )
                 
         # Look for related components in navigation or links
-        nav_references = RelationshipAnalyzer._find_navigation_references(soup)
+        if soup is not None:
+            nav_references = RelationshipAnalyzer._find_navigation_references(soup)
+        else:
+            nav_references = RelationshipAnalyzer._find_navigation_references_stdlib(html_content)
         for ref_component in nav_references:
             if ref_component != component_name:
-                dependencies.append(ComponentDependency(
-                    source=component_name,
-                    target=ref_component,
-                    relationship_type="related",
-                    description=f"Related component in navigation"
-                ))
+                dependencies.setdefault(
+                    (component_name, ref_component, "related"),
+                    f"Related component in navigation"
+                )
                 
         return dependencies
         
     @staticmethod
-    def _find_documentation_references(soup: BeautifulSoup) -> Set[str]:
-        """Find component references in documentation text."""
+    def _iter_text_nodes(html_content: Union[str, bytes]) -> Iterator[str]:
+        """Yield the text nodes of an HTML document while it is being parsed.
+        
+        Elements are cleared once their text has been read, so neither the full
+        tree nor the concatenated document text is ever held in memory.
+        """
+        if etree is None:
+            yield from RelationshipAnalyzer._iter_text_nodes_stdlib(html_content)
+            return
+            
+        if isinstance(html_content, str):
+            html_content = html_content.encode('utf-8')
+            
+        # Depth of open non-text elements; template content has child elements,
+        # so everything inside one is skipped, not just its own text
+        skip_depth = 0
+        try:
+            for event, elem in etree.iterparse(BytesIO(html_content), events=('start', 'end'),
+                                               html=True, recover=True, encoding='utf-8'):
+                if event == 'start':
+                    if elem.tag in _NON_TEXT_TAGS:
+                        skip_depth += 1
+                    continue
+                if elem.tag in _NON_TEXT_TAGS:
+                    skip_depth -= 1
+                elif not skip_depth:
+                    # Tails of children are complete once their parent has ended
+                    if elem.text:
+                        yield elem.text
+                    for child in elem:
+                        if child.tail:
+                            yield child.tail
+                elem.clear(keep_tail=True)
+        except etree.LxmlError:
+            # Empty or unparseable documents have no text to scan
+            return
+        
+    @staticmethod
+    def _iter_text_nodes_stdlib(html_content: Union[str, bytes]) -> Iterator[str]:
+        """Pure-Python _iter_text_nodes, used when lxml is not installed.
+        
+        The document is fed in chunks and the text nodes completed by each
+        chunk are yielded before the next one is parsed.
+        """
+        text = _decode_html(html_content)
+        parser = _TextNodeParser()
+        for start in range(0, len(text), _PARSER_CHUNK_SIZE):
+            parser.feed(text[start:start + _PARSER_CHUNK_SIZE])
+            yield from parser.texts
+            parser.texts.clear()
+        parser.close()
+        yield from parser.texts
+        
+    @staticmethod
+    def _find_documentation_references(html_content: Union[str, bytes],
+                                       known_components: Optional[FrozenSet[str]] = None) -> Set[str]:
+        """Find component references in documentation text.
+        
+        Args:
+            html_content: HTML content of the component page
+            known_components: If given, only these names are reported; with
+                pyahocorasick installed they are matched directly instead of
+                filtering every PascalCase word
+        """
         references = set()
         
+        if known_components is not None and ahocorasick is not None:
+            automaton = _component_name_automaton(known_components)
+            if automaton is None:
+                return references
+            for text in RelationshipAnalyzer._iter_text_nodes(html_content):
+                for end, name in automaton.iter(text):
+                    # Keep whole-word hits only, like the regex's word boundaries
+                    start = end - len(name) + 1
+                    if ((start == 0 or not _is_word_char(text[start - 1])) and
+                        (end + 1 == len(text) or not _is_word_char(text[end + 1]))):
+                        references.add(name)
+            return references
+        
         # Look for component names in text (PascalCase words)
-        text_content = soup.get_text()
-        pascal_case_pattern = r'\b([A-Z][a-zA-Z]*(?:[A-Z][a-zA-Z]*)*)\b'
-        matches = re.finditer(pascal_case_pattern, text_content)
-        
-        for match in matches:
-            word = match.group(1)
-            # Filter potential component names
-            if (len(word) > 2 and 
-                word not in ['API', 'HTML', 'CSS', 'DOM', 'URL', 'JSON', 'XML'] and
-                not word.endswith('s')):  # Avoid plurals
-                references.add(word)
+        for text in RelationshipAnalyzer._iter_text_nodes(html_content):
+            for match in _COMPONENT_WORD_RE.finditer(text):
+                word = match.group(1)
+                if word not in _NON_COMPONENT_WORDS:
+                    if known_components is None or word in known_components:
+                        references.add(word)
                 
         return references
         
     @staticmethod
-    def _find_navigation_references(soup: BeautifulSoup) -> Set[str]:
+    def _find_navigation_references(soup: "BeautifulSoup") -> Set[str]:
         """Find component references in navigation elements."""
         references = set()
         
         # Look for navigation links
-        nav_selectors = [
-            'nav a',
-            '.navigation a',
-            '.sidebar a',
-            '[data-testid*="nav"] a',
-            '.storybook-nav a'
-        ]
-        
-        for selector in nav_selectors:
+        for selector in _NAV_LINK_SELECTORS:
             links = soup.select(selector)
             for link in links:
                 href = link.get('href', '')
@@ -283,13 +576,28 @@ class RelationshipAnalyzer:
                     
         return references
         
+    @staticmethod
+    def _find_navigation_references_stdlib(html_content: Union[str, bytes]) -> Set[str]:
+        """Pure-Python _find_navigation_references, used when bs4 is not installed."""
+        parser = _NavigationLinkParser()
+        parser.feed(_decode_html(html_content))
+        parser.close()
+        
+        references = set()
+        for href, text in parser.links:
+            component_name = RelationshipAnalyzer._extract_component_name_from_link(href, text.strip())
+            if component_name:
+                references.add(component_name)
+                
+        return references
+        
     @staticmethod
     def _extract_component_name_from_link(href: str, text: str) -> Optional[str]:
         """Extract component name from a navigation link."""
         # Try to extract from href path
         if href:
             # Look for patterns like /component-name or ?component=ComponentName
-            path_match = re.search(r'/([a-zA-Z-]+)(?:--|\?|$)', href)
+            path_match = _HREF_PATH_RE.search(href)
             if path_match:
                 # Convert kebab-case to PascalCase
                 kebab_name = path_match.group(1)
@@ -297,14 +605,14 @@ class RelationshipAnalyzer:
                 return pascal_name
                 
             # Look for query parameters
-            param_match = re.search(r'[?&](?:component|story)=([^&]+)', href)
+            param_match = _HREF_PARAM_RE.search(href)
             if param_match:
                 return param_match.group(1)
                 
         # Try to extract from link text
         if text:
             # Clean up text and check if it looks like a component name
-            clean_text = re.sub(r'[^a-zA-Z]', '', text)
+            clean_text = _NON_ALPHA_RE.sub('', text)
             if clean_text and clean_text[0].isupper() and len(clean_text) > 2:
                 return clean_text
                 
@@ -322,7 +630,7 @@ class RelationshipAnalyzer:
             Dictionary mapping component names to their dependencies
         """
         all_dependencies = {}
-        component_names = {comp.get('name', '') for comp in components_data}
+        component_names = frozenset(comp.get('name', '') for comp in components_data)
         
         for comp_data in components_data:
             comp_name = comp_data.get('name', '')
@@ -341,7 +649,7 @@ class RelationshipAnalyzer:
             
             # Find dependencies
             dependencies = RelationshipAnalyzer.find_component_dependencies(
-                comp_name, code_content, html_content
+                comp_name, code_content, html_content, component_names
             )
             
             # Filter dependencies to only include known components
@@ -27,8 +27,6 @@ async def main():
     page_handler = PageHandler()
     crawler = ComponentCrawler(page_handler)
     
-    # First phase: Discover all links for debugging
-    logger.info("Phase 1: Discovering all component links...")
     from playwright.async_api import async_playwright
     
     async with async_playwright() as p:
@@ -42,40 +40,53 @@ async def main():
             logger.info(f"Navigating to start URL: {config.START_URL}")
             await page_handler.navigate_to_component(page, config.START_URL)
             
-            # Discover components
-            logger.info("Discovering components...")
-            discovered_components = await crawler.discover_components(page)
+            # Components are processed while discovery is still reading the
+            # explorer tree: discovery feeds a queue drained by a pool of workers,
+            # each using its own page in the shared browser context
+            logger.info("Discovering and processing components...")
+            base_url = page.url  # Relative component URLs resolve against the start page
+            queue: asyncio.Queue = asyncio.Queue()
             
-            # Deduplicate components by URL
+            async def worker():
+                while True:
+                    item = await queue.get()
+                    if item is None:
+                        return
+                    i, component = item
+                    logger.info(f"Processing component {i}: {component.name}")
+                    component_page = await context.new_page()
+                    try:
+                        component_data = await crawler.process_component(component, component_page, base_url)
+                        await crawler.save_component_data(component_data)
+                        logger.info(f"✓ Saved data for {component.name}")
+                    except Exception as e:
+                        logger.error(f"✗ Failed to process component {component.name}: {str(e)}")
+                    finally:
+                        await component_page.close()
+            
+            workers = [asyncio.create_task(worker()) for _ in range(config.CONCURRENCY)]
+            
+            # Deduplicate components by URL as they arrive, keeping the first occurrence
             seen_urls = set()
-            components = []
-            for component in discovered_components:
-                if component.url not in seen_urls:
-                    components.append(component)
+            discovered_count = 0
+            try:
+                async for component in crawler.discover_components_iter(page):
+                    discovered_count += 1
+                    if component.url in seen_urls:
+                        continue
                     seen_urls.add(component.url)
-                else:
-                    logger.info(f"Skipping duplicate URL: {component.url}")
-            
-            # Print all discovered links for debugging
-            logger.info(f"DISCOVERED {len(discovered_components)} COMPONENTS (before deduplication)")
-            logger.info(f"UNIQUE COMPONENTS: {len(components)} (after deduplication)")
-            logger.info("=" * 60)
-            for i, component in enumerate(components, 1):
-                logger.info(f"{i:2d}. Name: {component.name}")
-                logger.info(f"    URL:  {component.url}")
-                logger.info("-" * 40)
-            logger.info("=" * 60)
+                    logger.info(f"{len(seen_urls):2d}. Name: {component.name}")
+                    logger.info(f"    URL:  {component.url}")
+                    await queue.put((len(seen_urls), component))
+            finally:
+                # Let the workers finish queued components, then stop
+                for _ in workers:
+                    await queue.put(None)
+                await asyncio.gather(*workers, return_exceptions=True)
             
-            # Second phase: Process each discovered component
-            logger.info("\nPhase 2: Processing discovered components...")
-            for i, component in enumerate(components):
-                logger.info(f"Processing component {i+1}/{len(components)}: {component.name}")
-                try:
-                    component_data = await crawler.process_component(component, page)
-                    await crawler.save_component_data(component_data)
-                    logger.info(f"✓ Saved data for {component.name}")
-                except Exception as e:
-                    logger.error(f"✗ Failed to process component {component.name}: {str(e)}")
+            logger.info(f"DISCOVERED {discovered_count} COMPONENTS (before deduplication)")
+            logger.info(f"UNIQUE COMPONENTS: {len(seen_urls)} (after deduplication)")
+            logger.info(f"Skipped {discovered_count - len(seen_urls)} duplicate URLs")
         
         finally:
             # Clean up
@@ -1,42 +1,119 @@
 \
 import os
+import re
 import json
+import asyncio
+import heapq
 import logging
+import httpx
 from datetime import datetime
-from typing import Optional, Dict, Any
+from json.decoder import scanstring
+from typing import Optional, Dict, Any, Tuple, Iterator, Set
 from dotenv import load_dotenv
+from pydantic import ValidationError
 from graph_rag.extraction.extractor import ExtractionOrchestrator
-from graph_rag.extraction.data_models import ExtractedComponent, ComponentMetadata, ComponentProperty, UsageGuideline, CodeExample, ComponentDependency # Changed Relationship to ComponentDependency
+from graph_rag.extraction.extraction_cache import ExtractionCache
+from graph_rag.extraction.kg_extractor import KGExtractor, PROMPT_VERSION, LLM_METHODS
+from graph_rag.extraction.data_models import ExtractedComponent, ComponentMetadata, ComponentProperty, UsageGuideline, CodeExample, ComponentDependency, KGResult # Changed Relationship to ComponentDependency
+
+try:
+    import orjson
+except ImportError:  # Optional; the stdlib json module is used instead
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # Optional; large crawler files are then loaded whole
+    ijson = None
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Load environment variables
-env_path = os.path.join(os.path.dirname(__file__), '.env')
-logger.info(f"Loading .env from: {env_path}")
-if not load_dotenv(env_path):
-    logger.warning(f"No .env file found at {env_path}")
-
-# Debug log loaded environment variables
-logger.debug("Environment variables:")
-for k, v in os.environ.items():
-    if 'KEY' in k or 'SECRET' in k:
-        logger.debug(f"  {k}=[REDACTED]")
-    else:
-        logger.debug(f"  {k}={v}")
-
 # Configure logging level and format
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 
 # Define paths
 CRAWLER_OUTPUT_DIR = "./process/crawler/"
 KG_OUTPUT_DIR = "./process/extraction/"
+CACHE_DIR = os.path.join(KG_OUTPUT_DIR, ".cache")
+JSONL_OUTPUT_PATH = os.path.join(KG_OUTPUT_DIR, "kg_results.jsonl")
+ERRORS_OUTPUT_PATH = os.path.join(KG_OUTPUT_DIR, "errors.jsonl")
+
+# Connection pool shared by all LLM calls of a run; the read timeout matches the OpenAI SDK default
+LLM_HTTP_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=32)
+LLM_HTTP_TIMEOUT = httpx.Timeout(600.0, connect=5.0)
+
+# Pages shorter than this, or without any content landmark (a sectioning element,
+# a top-level heading or the Storybook root), are not worth an LLM call
+MIN_HTML_BYTES = 512
+_USEFUL = re.compile(rb'<(?:article|main|section|h[1-3])\b|storybook-root', re.IGNORECASE)
+
+# Crawler files larger than this are read for just the fields extraction reads
+STREAM_THRESHOLD_BYTES = 1024 * 1024
+CRAWLER_FIELDS = ('html', 'name', 'url')
+# Start of a string field's value, up to and including its opening quote
+_FIELD_RES = {field: re.compile(r'"' + field + r'"\s*:\s*"') for field in CRAWLER_FIELDS}
+
+# Files extracted concurrently unless --workers or GRAPH_RAG_WORKERS is set;
+# bounded in practice by the LLM provider's rate limits
+DEFAULT_WORKERS = 8
+
+def _json_loads(data: bytes) -> Any:
+    """Decodes UTF-8 JSON bytes, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _json_dumps_indented(obj: Any) -> bytes:
+    """Encodes obj as indented UTF-8 JSON, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+def _json_dumps_line(obj: Any) -> bytes:
+    """Encodes obj as one newline-terminated line of UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS) + b"\n"
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8') + b"\n"
+
+class KGResultWriter:
+    """Appends KG results to a single JSONL file, one line per source file.
+    
+    Lines are collected in memory and written with one os.write per
+    FLUSH_THRESHOLD bytes instead of an open/write/close per result.
+    Results are written from the event loop thread only.
+    """
+    
+    FLUSH_THRESHOLD = 128 * 1024
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._buffer = bytearray()
+        self._fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        
+    def write(self, result_dict: Dict[str, Any]) -> None:
+        self._buffer += _json_dumps_line(result_dict)
+        if len(self._buffer) >= self.FLUSH_THRESHOLD:
+            self.flush()
+            
+    def flush(self) -> None:
+        view = memoryview(self._buffer)
+        while view:
+            view = view[os.write(self._fd, view):]
+        view.release()
+        self._buffer.clear()
+        
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            os.close(self._fd)
 
 def load_crawler_data(file_path: str) -> Optional[dict]:
     """Loads a single JSON file from the crawler output."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(file_path, 'rb') as f:
+            data = _json_loads(f.read())
         logger.info(f"Successfully loaded crawler data from: {file_path}")
         return data
     except json.JSONDecodeError as e:
@@ -46,23 +123,127 @@ def load_crawler_data(file_path: str) -> Optional[dict]:
         logger.error(f"Error loading file {file_path}: {e}")
         return None
 
-def save_kg_result(kg_result, original_filename: str):
-    """Saves the KGResult to a JSON file in the KG_OUTPUT_DIR."""
+def slice_field(text: str, key: str) -> Optional[str]:
+    """Decodes the string value of key straight from raw crawler JSON text.
+    
+    Only the value's own literal is scanned, by the json module's C string
+    scanner. The first occurrence of key wins, which is the top-level field in
+    crawler output, where name, url and html are written before metadata.
+    
+    Returns:
+        The decoded string, or None if key has no string value
+        
+    Raises:
+        ValueError: If the string literal is malformed
+    """
+    match = _FIELD_RES[key].search(text)
+    if match is None:
+        return None
+    return scanstring(text, match.end())[0]
+
+def load_crawler_fields(file_path: str) -> Optional[dict]:
+    """Reads only CRAWLER_FIELDS from a large crawler JSON file.
+    
+    The fields are sliced out of the raw bytes, so the rest of the document is
+    never parsed; if any is missing, the file is parsed after all.
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            text = f.read().decode('utf-8')
+        fields = {}
+        for field in CRAWLER_FIELDS:
+            value = slice_field(text, field)
+            if value is None:
+                break
+            fields[field] = value
+        else:
+            logger.info(f"Successfully sliced crawler data from: {file_path}")
+            return fields
+    except ValueError as e:
+        logger.warning(f"Could not slice fields from {file_path}, parsing it instead: {e}")
+    except Exception as e:
+        logger.error(f"Error loading file {file_path}: {e}")
+        return None
+    
+    if ijson is None:
+        return load_crawler_data(file_path)
+    return stream_crawler_fields(file_path)
+
+def stream_crawler_fields(file_path: str) -> Optional[dict]:
+    """Streams only CRAWLER_FIELDS from a crawler JSON file with ijson.
+    
+    The rest of the document is never materialized, so peak memory is about
+    the size of the HTML rather than of the whole parsed file.
+    """
+    fields = {}
+    try:
+        with open(file_path, 'rb') as f:
+            for prefix, event, value in ijson.parse(f):
+                if prefix in CRAWLER_FIELDS and event == 'string':
+                    fields[prefix] = value
+                    if len(fields) == len(CRAWLER_FIELDS):
+                        break
+        logger.info(f"Successfully streamed crawler data from: {file_path}")
+        return fields
+    except ijson.JSONError as e:
+        logger.error(f"Error decoding JSON from {file_path}: {e}")
+        return None
+    except Exception as e:
+        logger.error(f"Error loading file {file_path}: {e}")
+        return None
+
+def iter_json_files(directory: str) -> Iterator[str]:
+    """Yields the names of the JSON files in directory, in directory order."""
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.endswith('.json') and entry.is_file():
+                yield entry.name
+
+def completed_jsonl_filenames(path: str) -> Set[str]:
+    """Returns the crawler filenames that already have a line in a JSONL results file."""
+    completed = set()
+    try:
+        with open(path, 'rb') as f:
+            for line in f:
+                try:
+                    completed.add(_json_loads(line)["filename"])
+                except (ValueError, KeyError, TypeError):
+                    # e.g. a line cut short by an interrupted run
+                    continue
+    except FileNotFoundError:
+        pass
+    return completed
+
+def kg_output_path(filename: str) -> str:
+    """Returns the path of the KG result file for a crawler file."""
+    return os.path.join(KG_OUTPUT_DIR, f"{os.path.splitext(filename)[0]}_kg.json")
+
+def save_kg_result(kg_result, original_filename: str, output_path: str,
+                   writer: Optional[KGResultWriter] = None, payload: Optional[bytes] = None):
+    """Saves the KGResult to output_path, or as a line of writer's JSONL file.
+    
+    payload, if given, is the result already serialized as JSON and is written as is.
+    """
     if not kg_result:
         logger.warning(f"No KG result to save for {original_filename}")
         return
 
-    base_filename = os.path.splitext(original_filename)[0]
-    output_filename = f"{base_filename}_kg.json"
-    output_path = os.path.join(KG_OUTPUT_DIR, output_filename)
+    if writer is not None:
+        try:
+            writer.write({"filename": original_filename, **kg_result.model_dump(mode='json')})
+            logger.info(f"Queued KG result for {original_filename} to: {writer.path}")
+        except (TypeError, OSError) as e:
+            logger.error(f"Error writing KG result for {original_filename} to {writer.path}: {e}")
+        return
 
     try:
-        # Convert KGResult to dict using its dict() method
-        result_dict = kg_result.dict()
-
-
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(result_dict, f, indent=2, ensure_ascii=False)
+        if payload is None and hasattr(kg_result, 'model_dump_json'):
+            # Pydantic models serialize in a single compiled pass, without an intermediate dict
+            payload = kg_result.model_dump_json(indent=2).encode('utf-8')
+        elif payload is None:
+            payload = _json_dumps_indented(kg_result.dict())
+        with open(output_path, 'wb') as f:
+            f.write(payload)
         logger.info(f"Successfully saved KG result to: {output_path}")
     except TypeError as e:
         logger.error(f"TypeError saving KG result for {original_filename} to {output_path}. Ensure KGResult is JSON serializable: {e}")
@@ -71,7 +252,23 @@ def save_kg_result(kg_result, original_filename: str):
         logger.error(f"Error saving KG result for {original_filename} to {output_path}: {e}")
 
 
-def main(max_docs: Optional[int] = None):
+def load_environment():
+    """Loads the .env file next to this script; called from main so importing has no side effects."""
+    env_path = os.path.join(os.path.dirname(__file__), '.env')
+    logger.info(f"Loading .env from: {env_path}")
+    if not load_dotenv(env_path):
+        logger.warning(f"No .env file found at {env_path}")
+
+
+def main(max_docs: Optional[int] = None, use_cache: bool = True, cache_dir: str = CACHE_DIR,
+         workers: Optional[int] = None, jsonl: bool = False, skip_existing: bool = False):
+    asyncio.run(main_async(max_docs=max_docs, use_cache=use_cache, cache_dir=cache_dir,
+                           workers=workers, jsonl=jsonl, skip_existing=skip_existing))
+
+async def main_async(max_docs: Optional[int] = None, use_cache: bool = True, cache_dir: str = CACHE_DIR,
+                     workers: Optional[int] = None, jsonl: bool = False,
+                     skip_existing: bool = False):
+    load_environment()
     logger.info("Starting KG extraction test process...")
     
     if not os.path.exists(CRAWLER_OUTPUT_DIR):
@@ -89,28 +286,69 @@ def main(max_docs: Optional[int] = None):
         logger.error("Or set the environment variable before running the script")
         return
 
+    # One HTTP client for the whole run, so connections and TLS sessions are reused
+    http_client = httpx.AsyncClient(limits=LLM_HTTP_LIMITS, timeout=LLM_HTTP_TIMEOUT)
     try:
-        orchestrator = ExtractionOrchestrator()
+        orchestrator = ExtractionOrchestrator(
+            kg_extractor=KGExtractor(async_http_client=http_client)
+        )
     except Exception as e:
         logger.error(f"Failed to initialize ExtractionOrchestrator: {e}")
+        await http_client.aclose()
         return
 
-    processed_files = 0
-    failed_files = 0
+    # Results are cached by page content, so unchanged pages skip both extraction calls.
+    # This is the only cache layer: without it every page is sent to the LLM.
+    cache = ExtractionCache(cache_dir) if use_cache else None
+    if cache is None:
+        logger.info("Extraction cache disabled - every page will be re-extracted")
 
-    json_files = sorted([f for f in os.listdir(CRAWLER_OUTPUT_DIR) if f.endswith('.json')])
     if max_docs:
-        json_files = json_files[:max_docs]
+        # Only the first max_docs names are kept, without sorting the whole listing
+        json_files = heapq.nsmallest(max_docs, iter_json_files(CRAWLER_OUTPUT_DIR))
         logger.info(f"Limiting processing to first {max_docs} files")
+    else:
+        json_files = sorted(iter_json_files(CRAWLER_OUTPUT_DIR))
+    
+    # Read after load_environment so GRAPH_RAG_WORKERS may also come from .env
+    workers = workers or int(os.getenv("GRAPH_RAG_WORKERS", DEFAULT_WORKERS))
+    semaphore = asyncio.Semaphore(workers)
+
+    # Bound once so the per-file body does no repeated attribute lookups
+    extract_base = orchestrator.extract_component
+    extract_kg = orchestrator.kg_extractor.aextract_knowledge_graph
+    model_name = orchestrator.kg_extractor.model_name
+    save = save_kg_result
+    
+    # Opened on the first extraction error, so runs without errors leave no file
+    errors_file = None
     
-    for filename in json_files:
+    def record_error(entry: Dict[str, Any]) -> None:
+        nonlocal errors_file
+        if errors_file is None:
+            errors_file = open(ERRORS_OUTPUT_PATH, 'ab', buffering=128 * 1024)
+        errors_file.write(_json_dumps_line(entry))
+
+    async def process(filename: str) -> Tuple[str, str]:
+        """Extract one crawler file; returns ("ok" | "fail", filename)."""
+        async with semaphore:
+            output_path = kg_output_path(filename)
+            
+            # A stat (or, with --jsonl, a set lookup) is all it takes to resume a
+            # run without redoing finished files
+            if skip_existing and (filename in completed if jsonl else os.path.exists(output_path)):
+                logger.info(f"Skipping {filename}: its KG result already exists")
+                return "ok", filename
+            
             file_path = os.path.join(CRAWLER_OUTPUT_DIR, filename)
             logger.info(f"Processing file: {filename}")
             
-            crawler_data = load_crawler_data(file_path)
+            if os.path.getsize(file_path) > STREAM_THRESHOLD_BYTES:
+                crawler_data = load_crawler_fields(file_path)
+            else:
+                crawler_data = load_crawler_data(file_path)
             if not crawler_data:
-                failed_files += 1
-                continue
+                return "fail", filename
 
             html_content = crawler_data.get("html")
             component_name = crawler_data.get("name", "UnknownComponent")
@@ -118,44 +356,92 @@ def main(max_docs: Optional[int] = None):
             
             if not html_content:
                 logger.warning(f"No HTML content found in {filename}. Skipping.")
-                failed_files += 1
-                continue
+                return "fail", filename
+            
+            # Encoded once for both the cache key and the lxml-based extractors
+            html_bytes = html_content.encode('utf-8', errors='replace')
+            
+            if len(html_bytes) < MIN_HTML_BYTES or not _USEFUL.search(html_bytes):
+                logger.info(f"Skipping thin page {filename}")
+                return "fail", filename
+            
+            if cache is not None:
+                cache_key = ExtractionCache.make_key(model_name, PROMPT_VERSION, html_bytes)
+                cached_result = cache.get(cache_key)
+                if cached_result is not None:
+                    try:
+                        kg_result = KGResult.model_validate(cached_result)
+                    except ValidationError as e:
+                        logger.warning(f"Ignoring invalid cached result for {filename}: {e}")
+                    else:
+                        logger.info(f"Using cached extraction result for {component_name} from {filename}")
+                        save(kg_result, filename, output_path, writer)
+                        return "ok", filename
             
             try:
                 # First, extract the base component data
                 logger.info(f"Extracting base component data for {component_name} from {filename}...")
                 # crawler_data is the dictionary loaded from the JSON file
-                component_data = orchestrator.extract_component(crawler_data)
+                # HTML parsing is blocking; keep it off the event loop
+                component_data = await asyncio.to_thread(
+                    extract_base, crawler_data, html_bytes=html_bytes
+                )
 
                 logger.info(f"Attempting KG extraction for {component_name} using kg_extractor...")
-                kg_result = orchestrator.kg_extractor.extract_knowledge_graph(
+                kg_result = await extract_kg(
                     component_data=component_data,
                     html_content=html_content # html_content is already extracted from crawler_data
                 )
-                
+            
                 if kg_result:
-                    save_kg_result(kg_result, filename)
-                    processed_files += 1
+                    # Only LLM results are cached; fallbacks should be retried next run
+                    cacheable = cache is not None and kg_result.extraction_metadata.get("method") in LLM_METHODS
+                    # Serialized once, for both the output file and the cache entry
+                    payload = None
+                    if writer is None or cacheable:
+                        payload = kg_result.model_dump_json(indent=2).encode('utf-8')
+                    save(kg_result, filename, output_path, writer, payload=payload)
+                    if cacheable:
+                        cache.set(cache_key, payload, ttl_seconds=ExtractionCache.ttl_for_url(source_url))
+                    return "ok", filename
                 else:
                     logger.warning(f"KG extraction returned no result for {filename}.")
-                    failed_files +=1
-                    
+                    return "fail", filename
+                
             except Exception as e:
                 logger.error(f"Error during KG extraction for {filename}: {e}", exc_info=True)
-                failed_files += 1
-                # Optionally save a placeholder or error file
-                error_kg_result = {
+                # Failures are appended to one buffered log instead of a file each
+                record_error({
                     "source_component": component_name,
                     "error": str(e),
                     "filename": filename
-                }
-                save_kg_result(error_kg_result, f"{os.path.splitext(filename)[0]}_error.json")
+                })
+                return "fail", filename
+
+    # Read before the writer appends to the file
+    completed = completed_jsonl_filenames(JSONL_OUTPUT_PATH) if jsonl and skip_existing else set()
+    # With --jsonl all results go to one buffered file instead of one file each
+    writer = KGResultWriter(JSONL_OUTPUT_PATH) if jsonl else None
+    try:
+        # Files are independent and dominated by LLM wait time, so their extractions
+        # overlap on one event loop, at most `workers` files at a time
+        results = await asyncio.gather(*[process(filename) for filename in json_files])
+    finally:
+        if writer is not None:
+            writer.close()
+        if errors_file is not None:
+            errors_file.close()
+        await http_client.aclose()
 
+    processed_files = sum(1 for status, _ in results if status == "ok")
+    failed_files = len(results) - processed_files
 
     logger.info(f"KG extraction process finished.")
     logger.info(f"Successfully processed files: {processed_files}")
     logger.info(f"Failed files: {failed_files}")
     logger.info(f"Output files created in: {KG_OUTPUT_DIR}")
+    if errors_file is not None:
+        logger.info(f"Extraction errors are logged in: {ERRORS_OUTPUT_PATH}")
 
 if __name__ == "__main__":
     import argparse
@@ -163,6 +449,17 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--max-docs", type=int, default=None,
                        help="Maximum number of documents to process")
+    parser.add_argument("--no-cache", action="store_true",
+                       help="Re-extract every page with the LLM, ignoring and not writing cached results")
+    parser.add_argument("--cache-dir", default=CACHE_DIR,
+                       help="Directory for cached extraction results")
+    parser.add_argument("--workers", type=int, default=None,
+                       help="Number of files processed concurrently (default: GRAPH_RAG_WORKERS or 8)")
+    parser.add_argument("--jsonl", action="store_true",
+                       help=f"Append all KG results to {JSONL_OUTPUT_PATH} instead of one file each")
+    parser.add_argument("--skip-existing", action="store_true",
+                       help="Skip files whose _kg.json output (or, with --jsonl, line in the JSONL output) already exists")
     args = parser.parse_args()
     
-    main(max_docs=args.max_docs)
+    main(max_docs=args.max_docs, use_cache=not args.no_cache, cache_dir=args.cache_dir,
+         workers=args.workers, jsonl=args.jsonl, skip_existing=args.skip_existing)
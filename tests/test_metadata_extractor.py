@@ -0,0 +1,40 @@
+"""Regression tests for MetadataExtractor.extract_properties_table."""
+
+import unittest
+
+from graph_rag.extraction.metadata_extractor import MetadataExtractor
+
+
+# Valid pages without any element content; lxml refuses to build a tree for them
+_EMPTY_DOCUMENTS = [
+    "<!DOCTYPE html>",
+    "<!-- c -->",
+    "<!DOCTYPE html>\n<!-- hidden -->\n",
+]
+
+
+class ExtractPropertiesTableTest(unittest.TestCase):
+
+    def test_document_without_elements_has_no_properties(self):
+        for html in _EMPTY_DOCUMENTS:
+            for content in (html, html.encode("utf-8")):
+                with self.subTest(content=content):
+                    self.assertEqual(MetadataExtractor.extract_properties_table(content), [])
+
+    def test_args_table_rows_are_extracted(self):
+        html = (
+            "<div class='sb-argstableBlock'><table><tbody>"
+            "<tr><td>size*</td><td>Button size</td><td>medium</td><td>select</td></tr>"
+            "</tbody></table></div>"
+        )
+        self.assertEqual(MetadataExtractor.extract_properties_table(html), [{
+            "name": "size*",
+            "description": "Button size",
+            "default": "medium",
+            "control": "select",
+            "required": True,
+        }])
+
+
+if __name__ == "__main__":
+    unittest.main()